@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
@@ -28,15 +29,15 @@ class AlertState:
         if not ids:
             return set()
 
-        seen: Set[str] = set()
+        # why: one json_each() bind keeps the SQL text constant for any number
+        # of ids, so sqlite3's statement cache reuses the prepared query
         with self._conn() as con:
-            chunk = 900
-            for i in range(0, len(ids), chunk):
-                part = ids[i : i + chunk]
-                q = f"SELECT job_id FROM seen_jobs WHERE job_id IN ({','.join(['?'] * len(part))})"
-                for (job_id,) in con.execute(q, part):
-                    seen.add(job_id)
-        return seen
+            rows = con.execute(
+                "SELECT job_id FROM seen_jobs "
+                "WHERE job_id IN (SELECT value FROM json_each(?))",
+                (json.dumps(ids),),
+            )
+            return {job_id for (job_id,) in rows}
 
     def mark_seen(self, job_ids: Iterable[str]) -> int:
         ids = [i for i in job_ids if i]
@@ -44,15 +45,10 @@ class AlertState:
             return 0
 
         now = datetime.now(timezone.utc).isoformat()
-        inserted = 0
         with self._conn() as con:
-            for job_id in ids:
-                try:
-                    con.execute(
-                        "INSERT INTO seen_jobs(job_id, first_seen_utc) VALUES(?, ?)",
-                        (job_id, now),
-                    )
-                    inserted += 1
-                except sqlite3.IntegrityError:
-                    pass
-        return inserted
+            before = con.total_changes
+            con.executemany(
+                "INSERT OR IGNORE INTO seen_jobs(job_id, first_seen_utc) VALUES(?, ?)",
+                [(job_id, now) for job_id in ids],
+            )
+            return con.total_changes - before
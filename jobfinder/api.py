@@ -9,13 +9,15 @@ import os
 import re
 import threading
 import time
+import uuid
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
 from flask import Blueprint, Flask, jsonify, render_template, request
+from flask.json.provider import DefaultJSONProvider
 import yaml
 from dotenv import load_dotenv
 
@@ -28,6 +30,12 @@ except Exception:
         return None
 
 
+try:
+    import orjson
+except Exception:
+    orjson = None  # type: ignore[assignment]
+
+
 from . import db, filtering, pipeline
 from .alerts.companies import load_companies
 from .alerts.emailer_gmail import send_email_gmail
@@ -43,6 +51,17 @@ _EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 _EMAIL_DEFAULT_LIMIT = 200
 _EMAIL_LIMIT_CAP = 500
 _EMAIL_MAX_ROWS = 80
+# /jobs/email with "background": true hands SMTP delivery to this pool; clients
+# poll /jobs/email/<job_id> for the outcome.
+_EMAIL_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="jobs-email")
+_EMAIL_JOBS: Dict[str, Future[None]] = {}
+_EMAIL_JOBS_MAX = 256
+_EMAIL_JOBS_LOCK = threading.Lock()
+# /jobs result cache: identical polls within the TTL skip the query.
+_JOBS_CACHE_TTL = 2.0
+_JOBS_CACHE_MAX = 512
+_JOBS_CACHE: Dict[Tuple[Any, ...], Tuple[float, List[Dict[str, Any]]]] = {}
+_JOBS_CACHE_LOCK = threading.Lock()
 
 
 class _ContextDefaultsFilter(logging.Filter):
@@ -379,6 +398,7 @@ def _run_startup_refresh(*, cities: List[str], keywords: List[str]) -> None:
         )
         return
 
+    _invalidate_jobs_cache()
     log.info("Auto refresh finished | summary=%s", summary)
     _update_startup_refresh_state(
         in_progress=False,
@@ -533,19 +553,14 @@ def _refresh_with_report(
     ) -> int:
         with db.session_scope() as session:
             company_row = db.upsert_company(session, company_payload)
-            seen_keys: List[str] = []
-            written = 0
-            for job in jobs:
-                row = db.upsert_job(
-                    session,
-                    company=company_row,
-                    job_dict=job,
-                    seen_at=seen_at,
-                    keywords=keywords_list,
-                    cities=cities_list,
-                )
-                seen_keys.append(row.job_key)
-                written += 1
+            seen_keys = db.upsert_jobs(
+                session,
+                company=company_row,
+                job_dicts=jobs,
+                seen_at=seen_at,
+                keywords=keywords_list,
+                cities=cities_list,
+            )
             db.mark_inactive(
                 session,
                 provider=company_row.provider,
@@ -553,7 +568,7 @@ def _refresh_with_report(
                 seen_keys=seen_keys,
                 seen_at=seen_at,
             )
-        return written
+        return len(seen_keys)
 
     db.init_db()
     cities_list = pipeline._expand_city_aliases(pipeline._as_str_list(cities))
@@ -617,10 +632,7 @@ def _refresh_with_report(
             if fetch_error:
                 raise RuntimeError(fetch_error)
 
-            jobs = [
-                pipeline._normalize_job(company_payload, provider_val, rj)
-                for rj in raw_jobs
-            ]
+            jobs = pipeline._normalize_jobs(company_payload, provider_val, raw_jobs)
             for job in jobs:
                 score_val, reasons = pipeline._compute_score(
                     job, keywords_list, cities_list
@@ -720,6 +732,30 @@ def _refresh_with_report(
     return summary, report
 
 
+def _jobs_cache_get(key: Tuple[Any, ...]) -> Optional[List[Dict[str, Any]]]:
+    with _JOBS_CACHE_LOCK:
+        hit = _JOBS_CACHE.get(key)
+    if hit is None or hit[0] <= time.monotonic():
+        return None
+    return hit[1]
+
+
+def _jobs_cache_put(key: Tuple[Any, ...], results: List[Dict[str, Any]]) -> None:
+    now = time.monotonic()
+    with _JOBS_CACHE_LOCK:
+        if len(_JOBS_CACHE) >= _JOBS_CACHE_MAX:
+            for stale in [k for k, (exp, _) in _JOBS_CACHE.items() if exp <= now]:
+                del _JOBS_CACHE[stale]
+            while len(_JOBS_CACHE) >= _JOBS_CACHE_MAX:
+                del _JOBS_CACHE[next(iter(_JOBS_CACHE))]
+        _JOBS_CACHE[key] = (now + _JOBS_CACHE_TTL, results)
+
+
+def _invalidate_jobs_cache() -> None:
+    with _JOBS_CACHE_LOCK:
+        _JOBS_CACHE.clear()
+
+
 @api.route("/refresh", methods=["POST"])
 def refresh() -> Any:
     if not _refresh_endpoint_enabled():
@@ -755,6 +791,7 @@ def refresh() -> Any:
         log.exception("API /refresh failed: %s", e)
         return jsonify({"error": str(e)}), 500
 
+    _invalidate_jobs_cache()
     log.info("API /refresh summary=%s", summary)
     return jsonify({"summary": summary})
 
@@ -793,6 +830,7 @@ def debug_refresh() -> Any:
         log.exception("API /debug/refresh failed: %s", e)
         return jsonify({"error": str(e)}), 500
 
+    _invalidate_jobs_cache()
     log.info("API /debug/refresh summary=%s", summary)
     return jsonify({"summary": summary, "companies": report})
 
@@ -850,23 +888,36 @@ def jobs() -> Any:
         lite,
     )
 
+    # why: only_new depends on alert state, not just the query string
+    cache_key = (
+        None
+        if only_new
+        else (db._database_url(), tuple(sorted(args.items(multi=True))))
+    )
+    cached = _jobs_cache_get(cache_key) if cache_key else None
+
     try:
-        results = pipeline.query_jobs(
-            provider=provider,
-            remote=remote,
-            min_score=min_score,
-            max_age_days=max_age_days,
-            cities=cities,
-            keywords=keywords,
-            compute_scores=compute_scores,
-            title_keywords=title_keywords,
-            orgs=orgs,
-            company_names=company_names,
-            only_active=only_active,
-            lite=lite,
-            limit=limit,
-            offset=offset,
-        )
+        if cached is not None:
+            results = cached
+        else:
+            results = pipeline.query_jobs(
+                provider=provider,
+                remote=remote,
+                min_score=min_score,
+                max_age_days=max_age_days,
+                cities=cities,
+                keywords=keywords,
+                compute_scores=compute_scores,
+                title_keywords=title_keywords,
+                orgs=orgs,
+                company_names=company_names,
+                only_active=only_active,
+                lite=lite,
+                limit=limit,
+                offset=offset,
+            )
+            if cache_key:
+                _jobs_cache_put(cache_key, results)
         if only_new:
             state_db = Path(
                 os.environ.get("ALERT_STATE_DB", "/tmp/jobfinder_alerts.sqlite")
@@ -908,6 +959,27 @@ def jobs() -> Any:
     )
 
 
+def _send_jobs_email(*, subject: str, text: str, to_addrs: List[str]) -> None:
+    try:
+        send_email_gmail(subject=subject, text=text, to_addrs=to_addrs)
+    except Exception as e:
+        # why: runs on the email pool; the status endpoint reports it, log it too
+        log.exception("API /jobs/email background send failed: %s", e)
+        raise
+
+
+def _track_email_job(future: Future[None]) -> str:
+    job_id = uuid.uuid4().hex
+    with _EMAIL_JOBS_LOCK:
+        _EMAIL_JOBS[job_id] = future
+        # drop the oldest finished jobs once the table is full
+        for old_id in [k for k, f in _EMAIL_JOBS.items() if f.done()]:
+            if len(_EMAIL_JOBS) <= _EMAIL_JOBS_MAX:
+                break
+            del _EMAIL_JOBS[old_id]
+    return job_id
+
+
 @api.route("/jobs/email", methods=["POST"])
 def jobs_email() -> Any:
     body: Dict[str, Any] = request.get_json(force=True, silent=True) or {}
@@ -948,6 +1020,7 @@ def jobs_email() -> Any:
     if fast is True and compute_scores is None:
         compute_scores = False
     lite = _parse_bool(body.get("lite")) is True
+    background = _parse_bool(body.get("background")) is True
 
     active_raw = body.get("active")
     if active_raw is None:
@@ -1001,17 +1074,43 @@ def jobs_email() -> Any:
         log.exception("API /jobs/email query failed: %s", e)
         return jsonify({"error": str(e)}), 500
 
-    try:
-        send_email_gmail(
-            subject=f"JobFinder: {len(results)} matching jobs",
-            text=_render_jobs_email_text(
-                jobs=results,
-                cities=cities,
-                keywords=keywords,
-                title_keywords=title_keywords,
-            ),
-            to_addrs=[email],
+    subject = f"JobFinder: {len(results)} matching jobs"
+    text = _render_jobs_email_text(
+        jobs=results,
+        cities=cities,
+        keywords=keywords,
+        title_keywords=title_keywords,
+    )
+
+    if background:
+        missing = next(
+            (k for k in ("SMTP_USER", "SMTP_PASS") if k not in os.environ), None
         )
+        if missing:
+            return jsonify(
+                {"error": f"SMTP is not configured (missing {missing})"}
+            ), 503
+        try:
+            future = _EMAIL_EXECUTOR.submit(
+                _send_jobs_email, subject=subject, text=text, to_addrs=[email]
+            )
+        except Exception as e:
+            log.exception("API /jobs/email enqueue failed: %s", e)
+            return jsonify({"error": str(e)}), 500
+        job_id = _track_email_job(future)
+        return jsonify(
+            {
+                "sent": False,
+                "queued": True,
+                "job_id": job_id,
+                "status_url": f"/jobs/email/{job_id}",
+                "count": len(results or []),
+                "message": f"Queued {len(results or [])} jobs for delivery to {email}",
+            }
+        ), 202
+
+    try:
+        send_email_gmail(subject=subject, text=text, to_addrs=[email])
     except KeyError as e:
         missing = str(e).strip("'")
         return jsonify({"error": f"SMTP is not configured (missing {missing})"}), 503
@@ -1028,6 +1127,22 @@ def jobs_email() -> Any:
     )
 
 
+@api.route("/jobs/email/<job_id>", methods=["GET"])
+def jobs_email_status(job_id: str) -> Any:
+    with _EMAIL_JOBS_LOCK:
+        future = _EMAIL_JOBS.get(job_id)
+    if future is None:
+        return jsonify({"error": "Unknown email job"}), 404
+    if not future.done():
+        return jsonify({"job_id": job_id, "status": "queued", "sent": False})
+    exc = future.exception()
+    if exc is not None:
+        return jsonify(
+            {"job_id": job_id, "status": "failed", "sent": False, "error": str(exc)}
+        )
+    return jsonify({"job_id": job_id, "status": "sent", "sent": True})
+
+
 @api.route("/alerts/searches", methods=["POST"])
 def create_saved_search_alert() -> Any:
     body: Dict[str, Any] = request.get_json(force=True, silent=True) or {}
@@ -1211,9 +1326,48 @@ def debug_providers() -> Any:
     return jsonify(pipeline.diagnose_providers())
 
 
+class _OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson, keeping DefaultJSONProvider output
+    (sorted keys, HTTP dates, pretty-printed debug responses via the fallback).
+    """
+
+    _OPTS = (
+        (
+            orjson.OPT_SORT_KEYS
+            | orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+        )
+        if orjson is not None
+        else 0
+    )
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # why: response() asks for compact separators, which is all orjson emits;
+        # anything else (indent, custom defaults) goes through json.dumps
+        if not kwargs or kwargs == {"separators": (",", ":")}:
+            try:
+                return orjson.dumps(
+                    obj, default=self.default, option=self._OPTS
+                ).decode()
+            except TypeError:
+                pass
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if not kwargs:
+            try:
+                return orjson.loads(s)
+            except orjson.JSONDecodeError:
+                pass
+        return super().loads(s, **kwargs)
+
+
 def create_app() -> Flask:
     setup_logging()  # respect LOG_LEVEL
     app = Flask(__name__, static_folder="static", template_folder="templates")
+    if orjson is not None:
+        app.json = _OrjsonProvider(app)
     CORS(app)
     app.register_blueprint(api)
     auto_refresh_on_start = _env_bool("AUTO_REFRESH_ON_START", True)
@@ -7,7 +7,17 @@ import os
 import threading
 from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
 
 from sqlalchemy import (
     JSON,
@@ -20,12 +30,17 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
     create_engine,
+    event,
+    func,
+    insert,
     inspect,
+    literal_column,
     select,
     text,
     update,
 )
 from sqlalchemy.engine import Engine
+from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import (
     DeclarativeBase,
@@ -35,6 +50,7 @@ from sqlalchemy.orm import (
     relationship,
     sessionmaker,
 )
+from sqlalchemy.pool import StaticPool
 
 from . import filtering
 from .filtering import Job as JobModel
@@ -101,6 +117,8 @@ class Job(Base):
     company_city: Mapped[Optional[str]] = mapped_column(String(255))
     title: Mapped[Optional[str]] = mapped_column(String(512))
     location: Mapped[Optional[str]] = mapped_column(String(512))
+    # why: normalized once at write time so read-time city filters skip per-row lower()
+    location_lower: Mapped[Optional[str]] = mapped_column(String(512))
     url: Mapped[str] = mapped_column(String(2048), nullable=False)
     remote: Mapped[Optional[bool]] = mapped_column(Boolean)
     work_mode: Mapped[Optional[str]] = mapped_column(String(32))
@@ -119,6 +137,14 @@ class Job(Base):
 
     __table_args__ = (
         Index("ix_jobs_active_created_id", "is_active", "created_at", "id"),
+        Index(
+            "ix_jobs_provider_active_created_id",
+            "provider",
+            "is_active",
+            "created_at",
+            "id",
+        ),
+        Index("ix_jobs_provider_org", "provider", "org"),
         Index("ix_jobs_provider", "provider"),
         Index("ix_jobs_org", "org"),
         Index("ix_jobs_company_name", "company_name"),
@@ -241,6 +267,16 @@ _SESSION_FACTORY: Optional[sessionmaker[Session]] = None
 _DB_URL: Optional[str] = None
 _SCHEMA_READY: set[str] = set()
 _SCHEMA_LOCK = threading.Lock()
+# Keys per IN (...) clause; stays well under SQLite's bound-parameter limit.
+_IN_CHUNK = 500
+# Bound parameters per multi-row INSERT on non-SQLite dialects (SQLite loads
+# through json_each instead). psycopg caps a statement at 65535 parameters;
+# unknown dialects get a conservative budget.
+_MAX_BIND_PARAMS = {"postgresql": 32000}
+_DEFAULT_MAX_BIND_PARAMS = 900
+# New rows per insert batch above which SQLite secondary indexes are rebuilt
+# after the load instead of maintained row by row.
+_DEFER_INDEX_ROWS = 5000
 
 
 def _database_url(url: Optional[str] = None) -> str:
@@ -252,6 +288,23 @@ def _database_url(url: Optional[str] = None) -> str:
     )
 
 
+def _is_sqlite_memory(url: str) -> bool:
+    return ":memory:" in url or "mode=memory" in url
+
+
+def _sqlite_on_connect(dbapi_conn: Any, _record: Any) -> None:
+    # why: WAL lets /jobs readers run while a refresh writes; pragmas are
+    # per-connection, and the pool keeps connections open so this runs rarely
+    cur = dbapi_conn.cursor()
+    try:
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute("PRAGMA cache_size=-20000")
+        cur.execute("PRAGMA busy_timeout=5000")
+    finally:
+        cur.close()
+
+
 def get_engine(url: Optional[str] = None) -> Engine:
     """
     Lazily create (and memoize) the SQLAlchemy engine.
@@ -264,7 +317,13 @@ def get_engine(url: Optional[str] = None) -> Engine:
     kwargs: Dict[str, Any] = {"future": True, "pool_pre_ping": True}
     if resolved.startswith("sqlite"):
         kwargs["connect_args"] = {"check_same_thread": False}
+        if "mode=memory" in resolved:
+            # why: a named in-memory DB lives only while a connection is open;
+            # one shared connection keeps it alive and visible to all threads
+            kwargs["poolclass"] = StaticPool
     _ENGINE = create_engine(resolved, **kwargs)
+    if resolved.startswith("sqlite") and not _is_sqlite_memory(resolved):
+        event.listen(_ENGINE, "connect", _sqlite_on_connect)
     _SESSION_FACTORY = sessionmaker(
         bind=_ENGINE,
         autoflush=False,
@@ -276,6 +335,24 @@ def get_engine(url: Optional[str] = None) -> Engine:
     return _ENGINE
 
 
+def dispose_engine(url: Optional[str] = None) -> None:
+    """
+    Close the memoized engine if it serves ``url`` and forget its schema state.
+
+    For a named in-memory SQLite DB this drops the last connection, which
+    frees the database itself.
+    """
+    global _ENGINE, _SESSION_FACTORY, _DB_URL
+    resolved = _database_url(url)
+    with _SCHEMA_LOCK:
+        _SCHEMA_READY.discard(resolved)
+    if _ENGINE is not None and _DB_URL == resolved:
+        _ENGINE.dispose()
+        _ENGINE = None
+        _SESSION_FACTORY = None
+        _DB_URL = None
+
+
 def get_session(url: Optional[str] = None) -> Session:
     engine = get_engine(url)
     assert _SESSION_FACTORY is not None
@@ -328,6 +405,13 @@ def _ensure_schema(engine: Engine) -> bool:
                     text("ALTER TABLE jobs ADD COLUMN company_city VARCHAR(255)")
                 )
             jobs_cols.add("company_city")
+        if "location_lower" not in jobs_cols:
+            with engine.begin() as conn:
+                conn.execute(
+                    text("ALTER TABLE jobs ADD COLUMN location_lower VARCHAR(512)")
+                )
+                _backfill_location_lower(conn)
+            jobs_cols.add("location_lower")
 
         with engine.begin() as conn:
             conn.execute(
@@ -336,6 +420,18 @@ def _ensure_schema(engine: Engine) -> bool:
                     "ON jobs (is_active, created_at, id)"
                 )
             )
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_jobs_provider_active_created_id "
+                    "ON jobs (provider, is_active, created_at, id)"
+                )
+            )
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_jobs_provider_org "
+                    "ON jobs (provider, org)"
+                )
+            )
             conn.execute(
                 text("CREATE INDEX IF NOT EXISTS ix_jobs_provider ON jobs (provider)")
             )
@@ -361,6 +457,26 @@ def _ensure_schema(engine: Engine) -> bool:
         return False
 
 
+def _backfill_location_lower(conn: Any) -> None:
+    rows = conn.execute(
+        text(
+            "SELECT id, location FROM jobs "
+            "WHERE location IS NOT NULL AND location_lower IS NULL"
+        )
+    ).all()
+    params = [
+        {"id": row_id, "loc": _location_lower(loc)} for row_id, loc in rows if loc
+    ]
+    if params:
+        conn.execute(
+            text("UPDATE jobs SET location_lower = :loc WHERE id = :id"), params
+        )
+
+
+def _location_lower(location: Any) -> Optional[str]:
+    return filtering.normalize(str(location)) if location else None
+
+
 def _coerce_bool(val: Any) -> Optional[bool]:
     if val is None:
         return None
@@ -475,80 +591,288 @@ def _score_job(
         return int(job_dict.get("score") or 0), str(job_dict.get("reasons") or "")
 
 
-def upsert_job(
-    session: Session,
-    *,
+# Columns an update only overwrites when the fresh value is non-empty.
+_JOB_KEEP_IF_EMPTY = (
+    "title",
+    "location",
+    "location_lower",
+    "url",
+    "work_mode",
+    "description",
+    "created_at",
+    "external_id",
+    "raw_json",
+    "reasons",
+    "company_name",
+    "company_city",
+)
+# Columns an update always overwrites.
+_JOB_OVERWRITE = ("remote", "last_seen_at", "is_active", "score", "company_id")
+
+
+def _job_values(
     company: Company,
     job_dict: Dict[str, Any],
+    *,
     seen_at: datetime,
     keywords: Sequence[str],
     cities: Sequence[str],
-) -> Job:
+) -> Dict[str, Any]:
+    """
+    Column values for one provider job. ``url`` is the raw URL (may be empty).
+    """
     provider = company.provider
     org = company.org
     external_id = str(job_dict.get("id") or "").strip() or None
     url = (job_dict.get("url") or "").strip()
-    job_key = build_job_key(provider, org, external_id, url)
 
-    created_at = _parse_datetime(job_dict.get("created_at"))
     description = _normalize_description(
         job_dict.get("description") or (job_dict.get("extra") or {}).get("description")
     )
     raw_json = job_dict.get("extra") or {}
     if not isinstance(raw_json, dict):
         raw_json = {"value": raw_json}
-    work_mode = (raw_json.get("work_mode") or "").lower() or None
-
     score_val, reasons = _score_job(job_dict, keywords, cities)
 
+    return {
+        "job_key": build_job_key(provider, org, external_id, url),
+        "provider": provider,
+        "org": org,
+        "company_id": company.id,
+        "company_name": company.name,
+        "company_city": company.city,
+        "title": job_dict.get("title"),
+        "location": job_dict.get("location"),
+        "location_lower": _location_lower(job_dict.get("location")),
+        "url": url,
+        "remote": _coerce_bool(job_dict.get("remote")),
+        "work_mode": (raw_json.get("work_mode") or "").lower() or None,
+        "description": description,
+        "created_at": _parse_datetime(job_dict.get("created_at")),
+        "last_seen_at": seen_at,
+        "is_active": True,
+        "external_id": external_id,
+        "raw_json": raw_json,
+        "score": score_val,
+        "reasons": reasons,
+    }
+
+
+def _merge_job_values(current: Dict[str, Any], values: Dict[str, Any]) -> None:
+    for col in _JOB_KEEP_IF_EMPTY:
+        if values[col]:
+            current[col] = values[col]
+    for col in _JOB_OVERWRITE:
+        current[col] = values[col]
+
+
+def _update_job_row(row: Job, values: Dict[str, Any], company: Company) -> None:
+    for col in _JOB_KEEP_IF_EMPTY:
+        if values[col]:
+            setattr(row, col, values[col])
+    for col in _JOB_OVERWRITE:
+        setattr(row, col, values[col])
+    row.company = company
+
+
+def upsert_job(
+    session: Session,
+    *,
+    company: Company,
+    job_dict: Dict[str, Any],
+    seen_at: datetime,
+    keywords: Sequence[str],
+    cities: Sequence[str],
+) -> Job:
+    values = _job_values(
+        company, job_dict, seen_at=seen_at, keywords=keywords, cities=cities
+    )
+    job_key = values["job_key"]
+
     stmt = select(Job).where(Job.job_key == job_key)
     row = session.execute(stmt).scalar_one_or_none()
 
     if row is None:
-        row = Job(
-            job_key=job_key,
-            provider=provider,
-            org=org,
-            company=company,
-            company_name=company.name,
-            company_city=company.city,
-            title=job_dict.get("title"),
-            location=job_dict.get("location"),
-            url=url or job_key,
-            remote=_coerce_bool(job_dict.get("remote")),
-            work_mode=work_mode,
-            description=description,
-            created_at=created_at,
-            last_seen_at=seen_at,
-            is_active=True,
-            external_id=external_id,
-            raw_json=raw_json,
-            score=score_val,
-            reasons=reasons,
-        )
+        values["url"] = values["url"] or job_key
+        row = Job(**values)
+        row.company = company
         session.add(row)
     else:
-        row.title = job_dict.get("title") or row.title
-        row.location = job_dict.get("location") or row.location
-        row.url = url or row.url
-        row.remote = _coerce_bool(job_dict.get("remote"))
-        row.work_mode = work_mode or row.work_mode
-        row.description = description or row.description
-        row.created_at = created_at or row.created_at
-        row.last_seen_at = seen_at
-        row.is_active = True
-        row.external_id = external_id or row.external_id
-        row.raw_json = raw_json or row.raw_json
-        row.score = score_val
-        row.reasons = reasons or row.reasons
-        row.company = company
-        row.company_name = company.name or row.company_name
-        row.company_city = company.city or row.company_city
+        _update_job_row(row, values, company)
 
     session.flush()
     return row
 
 
+def in_values(
+    session: Session, column: Any, values: Iterable[Any]
+) -> ColumnElement[bool]:
+    """
+    ``column IN values``. On SQLite the values go in as one json_each() bind,
+    so the SQL text is the same for any number of values and the connection's
+    prepared-statement cache is reused (plain IN changes text with each arity).
+    """
+    vals = list(values)
+    if session.get_bind().dialect.name != "sqlite":
+        return column.in_(vals)
+    value: ColumnElement[Any] = literal_column("value")
+    return column.in_(
+        select(value).select_from(func.json_each(json.dumps(vals))).scalar_subquery()
+    )
+
+
+def _json_rows_payload(
+    dialect: Any, cols: Sequence[str], rows: Sequence[Dict[str, Any]]
+) -> str:
+    """
+    Encode rows as a JSON array of arrays for json_each(), converting each value
+    with the column type's bind processor (dates, JSON, booleans).
+    """
+    table = cast(Any, Job.__table__)
+    procs = [
+        table.c[col].type.dialect_impl(dialect).bind_processor(dialect) for col in cols
+    ]
+    return json.dumps(
+        [
+            [proc(row[col]) if proc else row[col] for col, proc in zip(cols, procs)]
+            for row in rows
+        ]
+    )
+
+
+def _sqlite_update_from_supported(dialect: Any) -> bool:
+    version = getattr(dialect.dbapi, "sqlite_version_info", (0,))
+    return dialect.name == "sqlite" and tuple(version) >= (3, 33, 0)
+
+
+def _update_job_rows_sqlite(session: Session, rows: List[Dict[str, Any]]) -> None:
+    """
+    Apply the upsert_job update rules to existing rows in one UPDATE ... FROM
+    json_each(), without loading them into the session.
+    """
+    dialect = session.get_bind().dialect
+    cols = ["job_key", *_JOB_KEEP_IF_EMPTY, *_JOB_OVERWRITE]
+    pos = {col: f"json_extract(value, '$[{i}]')" for i, col in enumerate(cols)}
+    sets = []
+    for col in _JOB_KEEP_IF_EMPTY:
+        # why: mirror Python truthiness; an empty dict binds as '{}'
+        empties = "('', '{}')" if col == "raw_json" else "('')"
+        sets.append(
+            f"{col} = CASE WHEN coalesce({pos[col]}, '') NOT IN {empties} "
+            f"THEN {pos[col]} ELSE {col} END"
+        )
+    sets.extend(f"{col} = {pos[col]}" for col in _JOB_OVERWRITE)
+    stmt = text(
+        f"UPDATE jobs SET {', '.join(sets)} FROM json_each(:rows) "
+        f"WHERE jobs.job_key = {pos['job_key']}"
+    )
+    session.execute(stmt, {"rows": _json_rows_payload(dialect, cols, rows)})
+
+
+def _insert_job_rows(session: Session, rows: List[Dict[str, Any]]) -> None:
+    dialect = session.get_bind().dialect
+    if dialect.name != "sqlite":
+        # why: one multi-row VALUES statement per chunk, sized to the bind limit
+        max_params = _MAX_BIND_PARAMS.get(dialect.name, _DEFAULT_MAX_BIND_PARAMS)
+        per_chunk = max(1, max_params // len(rows[0]))
+        for i in range(0, len(rows), per_chunk):
+            session.execute(insert(Job).values(rows[i : i + per_chunk]))
+        return
+
+    # SQLite: ship the whole batch as one JSON array bound to a single
+    # parameter and let json_each() expand it, so no bind-limit chunking.
+    cols = list(rows[0])
+    table = cast(Any, Job.__table__)
+    payload = _json_rows_payload(dialect, cols, rows)
+    selects = ", ".join(f"json_extract(value, '$[{i}]')" for i in range(len(cols)))
+    stmt = text(
+        f"INSERT INTO jobs ({', '.join(cols)}) SELECT {selects} FROM json_each(:rows)"
+    )
+    deferred = []
+    if len(rows) > _DEFER_INDEX_ROWS:
+        # why: SQLite DDL is transactional, so concurrent readers keep the old
+        # indexes until commit; job_key's unique constraint stays in place
+        deferred = [ix for ix in table.indexes if not ix.unique]
+        for ix in deferred:
+            session.execute(text(f"DROP INDEX IF EXISTS {ix.name}"))
+    session.execute(stmt, {"rows": payload})
+    conn = session.connection()
+    for ix in deferred:
+        ix.create(conn)
+
+
+def upsert_jobs(
+    session: Session,
+    *,
+    company: Company,
+    job_dicts: Sequence[Dict[str, Any]],
+    seen_at: datetime,
+    keywords: Sequence[str],
+    cities: Sequence[str],
+) -> List[str]:
+    """
+    Batch upsert_job for one company: existing rows are loaded with one
+    SELECT and new rows are inserted in bulk (json_each on SQLite, multi-row
+    VALUES elsewhere).
+
+    Returns the job key of every input job, in input order.
+    """
+    if not job_dicts:
+        return []
+    prepared = [
+        _job_values(company, jd, seen_at=seen_at, keywords=keywords, cities=cities)
+        for jd in job_dicts
+    ]
+    keys = list(dict.fromkeys(v["job_key"] for v in prepared))
+    # why: on SQLite existing rows are updated set-wise, so only their keys
+    # are needed (an index-only probe) instead of full ORM rows
+    set_update = _sqlite_update_from_supported(session.get_bind().dialect)
+    if set_update:
+        session.flush()
+
+    existing: Dict[str, Optional[Job]] = {}
+    if set_update:
+        stmt_keys = select(Job.job_key).where(in_values(session, Job.job_key, keys))
+        existing.update((k, None) for k in session.execute(stmt_keys).scalars())
+    else:
+        for i in range(0, len(keys), _IN_CHUNK):
+            chunk = keys[i : i + _IN_CHUNK]
+            stmt = select(Job).where(Job.job_key.in_(chunk))
+            for found in session.execute(stmt).scalars():
+                existing[found.job_key] = found
+
+    new_rows: Dict[str, Dict[str, Any]] = {}
+    updates: Dict[str, Dict[str, Any]] = {}
+    for values in prepared:
+        job_key = values["job_key"]
+        # why: same job listed twice in one fetch folds like a re-upsert
+        if job_key in existing:
+            row = existing[job_key]
+            if row is not None:
+                _update_job_row(row, values, company)
+            elif job_key in updates:
+                _merge_job_values(updates[job_key], values)
+            else:
+                updates[job_key] = dict(values)
+        elif job_key in new_rows:
+            _merge_job_values(new_rows[job_key], values)
+        else:
+            new_rows[job_key] = values
+
+    if updates:
+        _update_job_rows_sqlite(session, list(updates.values()))
+        for obj in list(session.identity_map.values()):
+            if isinstance(obj, Job) and obj.job_key in updates:
+                session.expire(obj)
+    rows = list(new_rows.values())
+    for values in rows:
+        values["url"] = values["url"] or values["job_key"]
+    if rows:
+        _insert_job_rows(session, rows)
+    session.flush()
+    return [v["job_key"] for v in prepared]
+
+
 def mark_inactive(
     session: Session,
     *,
@@ -562,7 +886,7 @@ def mark_inactive(
     """
     conditions = [Job.provider == provider, Job.org == org]
     if seen_keys:
-        conditions.append(Job.job_key.not_in(list(seen_keys)))
+        conditions.append(~in_values(session, Job.job_key, seen_keys))
     stmt = update(Job).where(*conditions).values(is_active=False, last_seen_at=seen_at)
     res = session.execute(stmt)
     rowcount = getattr(res, "rowcount", None)
@@ -906,7 +1230,8 @@ def get_seen_job_keys_for_alert(
     if not normalized:
         return set()
     stmt = select(AlertSeenJob.job_key).where(
-        AlertSeenJob.alert_id == int(alert_id), AlertSeenJob.job_key.in_(normalized)
+        AlertSeenJob.alert_id == int(alert_id),
+        in_values(session, AlertSeenJob.job_key, normalized),
     )
     return {str(x) for x in session.scalars(stmt).all()}
 
@@ -3,6 +3,7 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from math import asin, cos, radians, sin, sqrt
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -37,8 +38,12 @@ def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     return R * c
 
 
+_WS_RE = re.compile(r"\s+")
+_TOKEN_SPLIT_RE = re.compile(r"[^a-z0-9]+")
+
+
 def normalize(s: str) -> str:
-    return re.sub(r"\s+", " ", s.strip().lower())
+    return _WS_RE.sub(" ", s.strip().lower())
 
 
 REMOTE_ONLY_TOKENS = {
@@ -79,7 +84,16 @@ def _parse_created_at(val: Any) -> Optional[datetime]:
         except Exception:
             return None
 
-    s = str(val).strip()
+    return _parse_created_at_str(str(val).strip())
+
+
+_TZ_NO_COLON_RE = re.compile(r"([+-]\d{2})(\d{2})$")
+
+
+# why: the same ISO strings repeat across rows and requests; datetimes are
+# immutable so sharing cached results is safe
+@lru_cache(maxsize=8192)
+def _parse_created_at_str(s: str) -> Optional[datetime]:
     if not s:
         return None
 
@@ -93,7 +107,7 @@ def _parse_created_at(val: Any) -> Optional[datetime]:
             pass
 
     cleaned = s[:-1] + "+00:00" if s.endswith("Z") else s
-    cleaned = re.sub(r"([+-]\d{2})(\d{2})$", r"\1:\2", cleaned)
+    cleaned = _TZ_NO_COLON_RE.sub(r"\1:\2", cleaned)
 
     for cand in (cleaned, s):
         try:
@@ -109,6 +123,23 @@ def _parse_created_at(val: Any) -> Optional[datetime]:
         return None
 
 
+@lru_cache(maxsize=256)
+def _normalized_terms(terms: Tuple[str, ...]) -> Tuple[str, ...]:
+    return tuple(normalize(t) for t in terms)
+
+
+@lru_cache(maxsize=256)
+def _terms_pattern(terms: Tuple[str, ...]) -> Optional[re.Pattern[str]]:
+    """
+    One alternation regex over the normalized terms, so a single C-level scan
+    answers "does any term occur in this text" (longest terms first).
+    """
+    needles = sorted(set(_normalized_terms(terms)), key=len, reverse=True)
+    if not needles:
+        return None
+    return re.compile("|".join(re.escape(n) for n in needles))
+
+
 def _extract_salary(desc: str):
     import re as _re
 
@@ -139,8 +170,7 @@ def score(
     t = normalize(job.title)
     loc = normalize(job.location or "")
     desc = normalize((job.extra or {}).get("description", "")[:4000])
-    for kw in keywords:
-        k = normalize(kw)
+    for k in _normalized_terms(tuple(keywords)):
         if k in t:
             s += 20
             reasons.append(f"title:{k}")
@@ -149,7 +179,8 @@ def score(
             s += int(0.1 * fuzz.partial_ratio(k, desc))
             if k in desc:
                 reasons.append(f"desc:{k}")
-    if cities and any(normalize(c) in loc for c in cities):
+    city_re = _terms_pattern(tuple(cities)) if cities else None
+    if city_re is not None and city_re.search(loc):
         s += 15
         reasons.append("city")
 
@@ -213,6 +244,10 @@ def apply_filters(
     )
     min_score = filters.get("min_score")
     max_age_days = filters.get("max_age_days")
+    # why: resolve per-call constants once instead of per row
+    min_score_val = int(min_score) if min_score is not None else None
+    max_age_val = int(max_age_days) if max_age_days is not None else None
+    now = datetime.now(timezone.utc)
     # City filter (substring match, case-insensitive). Match job location or company city.
     cities = [normalize(c) for c in (filters.get("cities") or []) if c]
 
@@ -243,9 +278,11 @@ def apply_filters(
 
         # City filter: match explicit locations; only fallback to company city for remote/blank.
         if cities:
-            locn = normalize(str(r.get("location") or ""))
+            locn = r.get("location_lower")
+            if locn is None:
+                locn = normalize(str(r.get("location") or ""))
             company_city = normalize(str(r.get("company_city") or ""))
-            locn_tokens = [t for t in re.split(r"[^a-z0-9]+", locn) if t]
+            locn_tokens = [t for t in _TOKEN_SPLIT_RE.split(locn) if t]
             remote_only = not locn_tokens or all(
                 t in REMOTE_ONLY_TOKENS for t in locn_tokens
             )
@@ -261,15 +298,13 @@ def apply_filters(
                 if not (is_remoteish and any(c in company_city for c in cities)):
                     continue
 
-        if min_score is not None and (r.get("score") or 0) < int(min_score):
+        if min_score_val is not None and (r.get("score") or 0) < min_score_val:
             continue
 
-        if max_age_days is not None and r.get("created_at"):
+        if max_age_val is not None and r.get("created_at"):
             dt = _parse_created_at(r.get("created_at"))
-            if dt:
-                age = (datetime.now(timezone.utc) - dt).days
-                if age > int(max_age_days):
-                    continue
+            if dt and (now - dt).days > max_age_val:
+                continue
 
         out.append(r)
     return out
@@ -282,12 +317,8 @@ def filter_by_title_keywords(
     Lightweight title filter used by the API/UI to avoid client-side filtering loops.
     Matches if any keyword substring is present (case-insensitive).
     """
-    needles = [normalize(k) for k in (keywords or []) if k]
-    if not needles:
+    pattern = _terms_pattern(tuple(k for k in (keywords or []) if k))
+    if pattern is None:
         return rows
-    out = []
-    for r in rows:
-        title = normalize(str(r.get("title") or ""))
-        if any(n in title for n in needles):
-            out.append(r)
-    return out
+    search = pattern.search
+    return [r for r in rows if search(normalize(str(r.get("title") or "")))]
@@ -1,6 +1,7 @@
 # file: jobfinder/pipeline.py
 from __future__ import annotations
 
+import functools
 import hashlib
 import importlib
 import importlib.util
@@ -9,23 +10,28 @@ import json
 import logging
 import os
 import re
-import ssl
 import sys
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, cast
-from urllib.parse import urlencode, urlparse
-from urllib.request import Request, urlopen
+from urllib.parse import urlparse
 
-from sqlalchemy import select
+import httpx
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.orm import load_only
 
 from . import db, filtering
 from .filtering import Job as JobModel
 from .filtering import apply_filters
 
+try:
+    import orjson
+except Exception:
+    orjson = None  # type: ignore[assignment]
+
 log = logging.getLogger(__name__)
 
 # Supported provider names used by scan()
@@ -58,6 +64,15 @@ _PROVIDER_HOST = {
     "workable": "apply.workable.com",
 }
 
+# Reverse lookup used to resolve a result URL's host to its provider
+_HOST_PROVIDER = {host: provider for provider, host in _PROVIDER_HOST.items()}
+
+# Precomputed `site:` clauses and default sources for discover()
+_PROVIDER_SITES = {
+    provider: f"site:{host}" for provider, host in _PROVIDER_HOST.items()
+}
+_DEFAULT_SOURCES: Tuple[str, ...] = tuple(_PROVIDER_HOST)
+
 _CITY_ALIASES = {
     # Normalize common spelling variations for query + matching.
     "tel aviv": ["tel aviv", "tel-aviv", "tel aviv-yafo", "tel aviv yafo"],
@@ -159,11 +174,15 @@ def _serpapi_cache_settings() -> Tuple[int, Path]:
 
 
 def _serpapi_cache_key(url: str, params: Optional[Dict[str, Any]]) -> str:
-    items = sorted((str(k), str(v)) for k, v in (params or {}).items())
-    raw = json.dumps(
-        {"url": url, "params": items}, sort_keys=True, separators=(",", ":")
-    )
-    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    # why: delimited blake2b avoids a JSON round-trip per lookup
+    h = hashlib.blake2b(digest_size=16)
+    h.update(url.encode("utf-8"))
+    for k, v in sorted((str(k), str(v)) for k, v in (params or {}).items()):
+        h.update(b"\x1f")
+        h.update(k.encode("utf-8"))
+        h.update(b"\x1e")
+        h.update(v.encode("utf-8"))
+    return h.hexdigest()
 
 
 def _serpapi_cache_read(
@@ -253,7 +272,7 @@ def _build_provider_queries(
             continue
         if p_norm in seen:
             continue
-        if p_norm not in _PROVIDER_HOST:
+        if p_norm not in _PROVIDER_SITES:
             continue
         seen.add(p_norm)
         cleaned.append(p_norm)
@@ -262,10 +281,10 @@ def _build_provider_queries(
         return []
 
     if combine and len(cleaned) > 1:
-        joined = " OR ".join(f"site:{_PROVIDER_HOST[p]}" for p in cleaned)
+        joined = " OR ".join(_PROVIDER_SITES[p] for p in cleaned)
         return [(None, f"({joined})")]
 
-    return [(p, f"site:{_PROVIDER_HOST[p]}") for p in cleaned]
+    return [(p, _PROVIDER_SITES[p]) for p in cleaned]
 
 
 def _provider_from_url(url: str) -> Optional[str]:
@@ -275,10 +294,14 @@ def _provider_from_url(url: str) -> Optional[str]:
         return None
     if not host:
         return None
-    for provider, base in _PROVIDER_HOST.items():
-        base_norm = base.lower()
-        if host == base_norm or host.endswith("." + base_norm):
+    # why: walk parent domains with dict lookups instead of scanning every provider
+    while host:
+        provider = _HOST_PROVIDER.get(host)
+        if provider:
             return provider
+        _, sep, host = host.partition(".")
+        if not sep:
+            break
     return None
 
 
@@ -322,18 +345,52 @@ def _extract_workday_org_from_host(host: str) -> Optional[str]:
     return first
 
 
+_HTTP_CLIENT: Optional[httpx.Client] = None
+_HTTP_CLIENT_LOCK = threading.Lock()
+
+
+def _http_client() -> httpx.Client:
+    """
+    Shared keep-alive client so repeated SerpAPI calls reuse TLS connections.
+    """
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None:
+        with _HTTP_CLIENT_LOCK:
+            if _HTTP_CLIENT is None:
+                _HTTP_CLIENT = httpx.Client(
+                    headers={
+                        "User-Agent": "jobfinder/0.3",
+                        "Accept": "application/json",
+                    },
+                    follow_redirects=True,
+                    limits=httpx.Limits(
+                        max_connections=16, max_keepalive_connections=8
+                    ),
+                )
+    return _HTTP_CLIENT
+
+
+def _close_http_client() -> None:
+    global _HTTP_CLIENT
+    with _HTTP_CLIENT_LOCK:
+        if _HTTP_CLIENT is not None:
+            _HTTP_CLIENT.close()
+            _HTTP_CLIENT = None
+
+
 def _http_get_json(
     url: str, params: Optional[Dict[str, Any]] = None, timeout: float = 25.0
 ) -> Any:
-    # why: no external deps
-    qs = ("?" + urlencode(params)) if params else ""
-    req = Request(
-        url + qs, headers={"User-Agent": "jobfinder/0.3", "Accept": "application/json"}
-    )
-    ctx = ssl.create_default_context()
-    with urlopen(req, timeout=timeout, context=ctx) as resp:
-        data = resp.read()
-        return json.loads(data.decode("utf-8", errors="ignore"))
+    resp = _http_client().get(url, params=params, timeout=timeout)
+    resp.raise_for_status()
+    data = resp.content
+    if orjson is not None:
+        # why: parse straight from bytes; fall back on invalid UTF-8
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data.decode("utf-8", errors="ignore"))
 
 
 _RESERVED_SLUGS = {
@@ -353,9 +410,13 @@ _RESERVED_SLUGS = {
     "p",  # recruitee / breezy junk
 }
 
-_slug_re = re.compile(r"^[a-z0-9](?:[a-z0-9_-]{0,62}[a-z0-9])$")
+# Slug shape: 2-64 chars of [a-z0-9_-], starting and ending alphanumeric.
+_SLUG_EDGE_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789")
+_SLUG_CHARS = _SLUG_EDGE_CHARS | {"-", "_"}
 
 
+# why: discovery re-sees the same slugs/URLs across cities and keyword batches
+@functools.lru_cache(maxsize=4096)
 def _is_valid_org_slug(slug: str | None) -> bool:
     if not slug:
         return False
@@ -368,9 +429,16 @@ def _is_valid_org_slug(slug: str | None) -> bool:
     # must contain at least two letters (rejects numeric-only and 1-letter combos)
     if sum(1 for ch in s if ch.isalpha()) < 2:
         return False
-    return bool(_slug_re.match(s))
+    # why: set membership beats the regex engine on these short strings
+    return (
+        len(s) <= 64
+        and s[0] in _SLUG_EDGE_CHARS
+        and s[-1] in _SLUG_EDGE_CHARS
+        and _SLUG_CHARS.issuperset(s)
+    )
 
 
+@functools.lru_cache(maxsize=4096)
 def _extract_org_from_url(_provider: str, url: str) -> Optional[str]:
     try:
 
@@ -485,7 +553,15 @@ def _extract_city_from_result(item: Dict[str, Any], cities: List[str]) -> Option
     return None
 
 
+# why: successful imports are kept so refresh/verify workers don't redo
+# find_spec + import per company; failures are retried on the next call
+_PROVIDER_MODULES: Dict[str, Any] = {}
+
+
 def _import_provider(provider: str):
+    cached = _PROVIDER_MODULES.get(provider)
+    if cached is not None:
+        return cached
     # try both layouts; log details
     last_exc: Optional[BaseException] = None
     for modname in (f"jobfinder.providers.{provider}", f"providers.{provider}"):
@@ -503,6 +579,7 @@ def _import_provider(provider: str):
                 modname,
                 getattr(mod, "__file__", None),
             )
+            _PROVIDER_MODULES[provider] = mod
             return mod
         except Exception as e:
             last_exc = e
@@ -635,40 +712,52 @@ def _infer_work_mode(title: str, location: str, remote_flag: Optional[bool]) ->
     return ""
 
 
+def _normalize_jobs(
+    company: Dict[str, Any], provider: str, raws: Iterable[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Normalize one company's raw provider jobs. Per-company values and lookups
+    are resolved once outside the per-job loop.
+    """
+    org = company.get("org") or company.get("name") or ""
+    company_name = (company.get("name") or org or "").strip()
+    infer_work_mode = _infer_work_mode
+    out: List[Dict[str, Any]] = []
+    append = out.append
+    for raw in raws:
+        get = raw.get
+        title = str(get("title")).strip()
+        location = str(get("location") or get("city") or get("office") or "").strip()
+        url = str(get("url") or get("apply_url") or get("absolute_url") or "").strip()
+        jid = str(get("id") or get("job_id") or url).strip()
+        created_at = str(
+            get("created_at") or get("updated_at") or get("published_at") or ""
+        ).strip()
+        remote_val = get("remote")
+        remote_flag = remote_val if isinstance(remote_val, bool) else None
+        work_mode = infer_work_mode(title, location, remote_flag)
+        append(
+            {
+                "id": jid or url or f"{provider}:{org}:{title}",
+                "title": title,
+                "company": company_name,
+                "provider": provider,
+                "location": location,
+                "url": url,
+                "created_at": created_at,
+                "remote": remote_flag
+                if remote_flag is not None
+                else (work_mode == "remote"),
+                "extra": {**raw, "work_mode": work_mode},
+            }
+        )
+    return out
+
+
 def _normalize_job(
     company: Dict[str, Any], provider: str, raw: Dict[str, Any]
 ) -> Dict[str, Any]:
-    org = company.get("org") or company.get("name") or ""
-    title = _norm(str(raw.get("title")))
-    location = _norm(
-        str(raw.get("location") or raw.get("city") or raw.get("office") or "")
-    )
-    url = _norm(
-        str(raw.get("url") or raw.get("apply_url") or raw.get("absolute_url") or "")
-    )
-    jid = _norm(str(raw.get("id") or raw.get("job_id") or url))
-    created_at = _norm(
-        str(
-            raw.get("created_at")
-            or raw.get("updated_at")
-            or raw.get("published_at")
-            or ""
-        )
-    )
-    remote_val = raw.get("remote")
-    remote_flag = remote_val if isinstance(remote_val, bool) else None
-    work_mode = _infer_work_mode(title, location, remote_flag)
-    return {
-        "id": jid or url or f"{provider}:{org}:{title}",
-        "title": title,
-        "company": (company.get("name") or org or "").strip(),
-        "provider": provider,
-        "location": location,
-        "url": url,
-        "created_at": created_at,
-        "remote": remote_flag if remote_flag is not None else (work_mode == "remote"),
-        "extra": {**raw, "work_mode": work_mode},
-    }
+    return _normalize_jobs(company, provider, (raw,))[0]
 
 
 def _city_match(location: str, cities: Iterable[Any]) -> bool:
@@ -681,25 +770,25 @@ def _city_match(location: str, cities: Iterable[Any]) -> bool:
 
 
 def _dedupe(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    seen: Dict[str, Dict[str, Any]] = {}
-    order: List[str] = []
+    # why: ids are only unique within a provider ("1" on greenhouse and lever
+    # are different jobs); dicts keep first-seen order
+    seen: Dict[Tuple[str, str], Dict[str, Any]] = {}
     out: List[Dict[str, Any]] = []
     for j in jobs:
-        key = j.get("id") or j.get("url")
-        if not key:
+        jid = j.get("id") or j.get("url")
+        if not jid:
             out.append(j)
             continue
-        if key not in seen:
+        key = (str(j.get("provider") or ""), str(jid))
+        existing = seen.get(key)
+        if existing is None:
             seen[key] = j
-            order.append(key)
             continue
-        existing = seen[key]
         curr_dt = filtering._parse_created_at(j.get("created_at"))
         prev_dt = filtering._parse_created_at(existing.get("created_at"))
         if (curr_dt and prev_dt and curr_dt > prev_dt) or (curr_dt and not prev_dt):
             seen[key] = j
-    for key in order:
-        out.append(seen[key])
+    out.extend(seen.values())
     return out
 
 
@@ -857,9 +946,10 @@ def discover(
         log.warning("Discover skipped: missing SERPAPI_API_KEY")
         return []
     if not sources:
-        sources = list(_PROVIDER_HOST.keys())
+        sources = list(_DEFAULT_SOURCES)
     cities_expanded = _expand_city_aliases(_as_str_list(cities))
-    q_keywords = " ".join([k for k in (keywords or []) if _norm(k)]) if keywords else ""
+    q_keywords = " ".join(_as_str_list(keywords))
+    kws_part = f" {q_keywords}" if q_keywords else ""
     num_results = _env_int("SERPAPI_NUM_RESULTS", 100, min_val=10, max_val=100)
     no_cache = _env_bool("SERPAPI_NO_CACHE", False)
     city_mode = (os.getenv("SERPAPI_CITY_MODE") or "or").strip().lower()
@@ -874,14 +964,10 @@ def discover(
     for provider_hint, provider_clause in provider_queries:
         host_hint = _PROVIDER_HOST.get(provider_hint) if provider_hint else None
         for city_clause, city_value in city_queries:
-            q_parts = []
-            if provider_clause:
-                q_parts.append(provider_clause)
             if city_clause:
-                q_parts.append(city_clause)
-            if q_keywords:
-                q_parts.append(q_keywords)
-            q = " ".join(q_parts).strip()
+                q = f"{provider_clause} {city_clause}{kws_part}"
+            else:
+                q = f"{provider_clause}{kws_part}"
             params = {
                 "engine": "google",
                 "q": q,
@@ -1007,8 +1093,7 @@ def _process_company_jobs(
         raw_jobs = []
 
     company_jobs: List[Dict[str, Any]] = []
-    for rj in raw_jobs or []:
-        j = _normalize_job(company, cprov, rj)
+    for j in _normalize_jobs(company, cprov, raw_jobs or []):
         if compute_scores:
             score_val, reasons = _compute_score(j, keywords, cities)
             j["score"] = score_val
@@ -1164,6 +1249,8 @@ def refresh(
 
     refreshed = 0
     marked_inactive = 0
+    keywords_list = _as_str_list(keywords)
+    cities_list = _expand_city_aliases(_as_str_list(cities))
 
     with db.session_scope(db_url) as session:
         for comp in companies or []:
@@ -1175,18 +1262,15 @@ def refresh(
 
             key = (company_row.provider, company_row.org)
             company_jobs = per_company.get(key, [])
-            seen_keys: List[str] = []
-            for job in company_jobs:
-                row = db.upsert_job(
-                    session,
-                    company=company_row,
-                    job_dict=job,
-                    seen_at=now,
-                    keywords=_as_str_list(keywords),
-                    cities=_expand_city_aliases(_as_str_list(cities)),
-                )
-                seen_keys.append(row.job_key)
-                refreshed += 1
+            seen_keys = db.upsert_jobs(
+                session,
+                company=company_row,
+                job_dicts=company_jobs,
+                seen_at=now,
+                keywords=keywords_list,
+                cities=cities_list,
+            )
+            refreshed += len(seen_keys)
 
             marked_inactive += db.mark_inactive(
                 session,
@@ -1207,6 +1291,86 @@ def refresh(
 # ----------------- query (DB only) -----------------
 
 
+def _sql_prefilters(
+    *, remote: str, min_score: Optional[int], max_age_days: Optional[int]
+) -> List[Any]:
+    """
+    SQL equivalents of the apply_filters checks that only need stored columns.
+    ``min_score`` is None when scores are recomputed at query time.
+    """
+    job = db.Job
+    conds: List[Any] = []
+    mode = str(remote or "").lower()
+    if mode == "hybrid":
+        conds.append(job.work_mode == "hybrid")
+    elif mode == "true":
+        conds.append(
+            or_(
+                job.work_mode == "remote",
+                and_(job.work_mode.is_(None), job.remote.is_(True)),
+            )
+        )
+    elif mode == "false":
+        conds.append(
+            or_(
+                job.work_mode == "onsite",
+                and_(
+                    job.work_mode.is_(None),
+                    or_(job.remote.is_(None), job.remote.is_(False)),
+                ),
+            )
+        )
+    if min_score:
+        conds.append(func.coalesce(job.score, 0) >= min_score)
+    if max_age_days is not None:
+        # (now - created_at).days <= N  <=>  created_at > now - (N + 1) days
+        cutoff = datetime.now(timezone.utc) - timedelta(days=int(max_age_days) + 1)
+        conds.append(or_(job.created_at.is_(None), job.created_at > cutoff))
+    return conds
+
+
+# Minimum rows fetched per query_jobs batch.
+_QUERY_BATCH_MIN = 500
+
+# why: built once; statements are immutable, so each query only adds its
+# filters, and SQLAlchemy's compiled cache sees the same base every call
+_JOBS_STMT = select(db.Job).order_by(db.Job.created_at.desc(), db.Job.id.desc())
+_JOBS_LITE_STMT = _JOBS_STMT.options(
+    load_only(
+        db.Job.job_key,
+        db.Job.external_id,
+        db.Job.title,
+        db.Job.company_name,
+        db.Job.company_city,
+        db.Job.provider,
+        db.Job.org,
+        db.Job.location,
+        db.Job.location_lower,
+        db.Job.url,
+        db.Job.created_at,
+        db.Job.last_seen_at,
+        db.Job.is_active,
+        db.Job.remote,
+        db.Job.work_mode,
+        db.Job.score,
+        db.Job.reasons,
+    )
+)
+
+
+def _after_row(row: Any, *, nulls_first: bool) -> Any:
+    """
+    Keyset condition for rows after ``row`` in (created_at DESC, id DESC) order.
+    """
+    created, row_id = row.created_at, row.id
+    col, id_col = db.Job.created_at, db.Job.id
+    if created is None:
+        cond = and_(col.is_(None), id_col < row_id)
+        return or_(cond, col.is_not(None)) if nulls_first else cond
+    cond = or_(col < created, and_(col == created, id_col < row_id))
+    return cond if nulls_first else or_(cond, col.is_(None))
+
+
 def query_jobs(
     *,
     provider: Optional[str] = None,
@@ -1251,44 +1415,35 @@ def query_jobs(
         return []
 
     with db.session_scope(db_url) as session:
-        base_stmt = select(db.Job).order_by(db.Job.created_at.desc(), db.Job.id.desc())
-        if effective_lite:
-            base_stmt = base_stmt.options(
-                load_only(
-                    db.Job.job_key,
-                    db.Job.external_id,
-                    db.Job.title,
-                    db.Job.company_name,
-                    db.Job.company_city,
-                    db.Job.provider,
-                    db.Job.org,
-                    db.Job.location,
-                    db.Job.url,
-                    db.Job.created_at,
-                    db.Job.last_seen_at,
-                    db.Job.is_active,
-                    db.Job.remote,
-                    db.Job.work_mode,
-                    db.Job.score,
-                    db.Job.reasons,
-                )
-            )
+        base_stmt = _JOBS_LITE_STMT if effective_lite else _JOBS_STMT
         if only_active:
             base_stmt = base_stmt.where(db.Job.is_active.is_(True))
         if prov_filter:
             base_stmt = base_stmt.where(db.Job.provider == prov_filter)
         if org_set:
-            base_stmt = base_stmt.where(db.Job.org.in_(org_set))
+            base_stmt = base_stmt.where(db.in_values(session, db.Job.org, org_set))
         if company_name_set:
-            base_stmt = base_stmt.where(db.Job.company_name.in_(company_name_set))
+            base_stmt = base_stmt.where(
+                db.in_values(session, db.Job.company_name, company_name_set)
+            )
+        # why: narrow in SQL so fewer rows cross into Python; apply_filters
+        # below still runs and remains the source of truth
+        base_stmt = base_stmt.where(
+            *_sql_prefilters(
+                remote=remote,
+                min_score=None if compute_scores else int(min_score or 0),
+                max_age_days=max_age_days,
+            )
+        )
 
-        batch_size = max(limit_val * 2, 500)
+        batch_size = max(limit_val * 2, _QUERY_BATCH_MIN)
         filtered: List[Dict[str, Any]] = []
-        fetch_offset = 0
         target = offset_val + limit_val
+        # why: DESC puts NULL created_at first on Postgres, last on SQLite
+        nulls_first = session.get_bind().dialect.name == "postgresql"
+        stmt = base_stmt.limit(batch_size)
 
         while True:
-            stmt = base_stmt.offset(fetch_offset).limit(batch_size)
             rows = session.scalars(stmt).all()
             if not rows:
                 break
@@ -1296,6 +1451,11 @@ def query_jobs(
             jobs_batch = [
                 db.job_to_dict(r, include_extra=not effective_lite) for r in rows
             ]
+            if cities_list:
+                # why: the city filter reads the stored lowered location; it is
+                # internal, so it is attached here and stripped after filtering
+                for j, r in zip(jobs_batch, rows):
+                    j["location_lower"] = r.location_lower
 
             if compute_scores:
                 # Recompute score at query-time so filters reflect the active keyword set.
@@ -1313,6 +1473,9 @@ def query_jobs(
                 max_age_days=max_age_days,
                 cities=cities_list,
             )
+            if cities_list:
+                for j in jobs_batch:
+                    j.pop("location_lower", None)
 
             if title_kw_list and hasattr(filtering, "filter_by_title_keywords"):
                 try:
@@ -1329,6 +1492,10 @@ def query_jobs(
             if len(rows) < batch_size:
                 break
 
-            fetch_offset += batch_size
+            # why: seek past the last row instead of OFFSET, which rescans
+            # every earlier batch
+            stmt = base_stmt.where(_after_row(rows[-1], nulls_first=nulls_first)).limit(
+                batch_size
+            )
 
     return filtered[offset_val : offset_val + limit_val]
@@ -1,11 +1,49 @@
 # file: jobfinder/providers/_http.py
 from __future__ import annotations
 import json
-import ssl
+import threading
 from typing import Any, Dict, Optional
-from urllib.error import HTTPError
 from urllib.parse import urlencode
-from urllib.request import Request, urlopen
+
+import httpx
+
+try:
+    import orjson
+except Exception:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import h2  # noqa: F401
+
+    _HTTP2 = True
+except Exception:
+    _HTTP2 = False
+
+_CLIENT: Optional[httpx.Client] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def _client() -> httpx.Client:
+    """
+    Shared keep-alive client so provider fetches reuse TLS connections
+    (HTTP/2 when the optional h2 package is installed).
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = httpx.Client(
+                    headers={
+                        "User-Agent": "jobfinder/0.3",
+                        "Accept": "application/json",
+                    },
+                    follow_redirects=True,
+                    http2=_HTTP2,
+                    limits=httpx.Limits(
+                        max_connections=32, max_keepalive_connections=20
+                    ),
+                )
+    return _CLIENT
 
 
 def get_json(
@@ -13,15 +51,15 @@ def get_json(
 ) -> Any:
     """Fetch JSON from a URL."""
     qs = ("?" + urlencode(params)) if params else ""
-    req = Request(
-        url + qs, headers={"User-Agent": "jobfinder/0.3", "Accept": "application/json"}
-    )
-    ctx = ssl.create_default_context()
-    try:
-        with urlopen(req, timeout=timeout, context=ctx) as resp:
-            data = resp.read()
-            return json.loads(data.decode("utf-8", errors="ignore"))
-    except HTTPError as exc:
-        if exc.code == 404:
-            return {}
-        raise
+    resp = _client().get(url + qs, timeout=timeout)
+    if resp.status_code == 404:
+        return {}
+    resp.raise_for_status()
+    data = resp.content
+    if orjson is not None:
+        # why: parse straight from bytes; fall back on invalid UTF-8
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data.decode("utf-8", errors="ignore"))
@@ -1,16 +1,25 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import os
+import re
+import threading
 import time
 import logging
-from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from jobfinder import pipeline
 
+try:
+    import orjson
+except Exception:
+    orjson = None  # type: ignore[assignment]
+
 
 def _sanitize_city(city: str) -> str:
     return (city or "").replace('"', "").strip()
@@ -48,6 +57,11 @@ def _parse_args() -> argparse.Namespace:
         default="jobfinder/static/companies.json",
         help="Origin companies.json to update with verified companies.",
     )
+    parser.add_argument(
+        "--strict-verify",
+        action="store_true",
+        help="Always call the provider API, even for Workable job-link hits.",
+    )
     return parser.parse_args()
 
 
@@ -61,35 +75,53 @@ def _setup_logging() -> None:
     )
 
 
+@functools.lru_cache(maxsize=4096)
 def _is_workable_job_link(url: str, org: str) -> bool:
-    try:
-        parts = [s for s in urlparse(url).path.split("/") if s]
-    except Exception:
+    # why: only the path is needed; slicing skips urlparse's full split
+    scheme_end = url.find("://")
+    path_start = url.find("/", scheme_end + 3) if scheme_end >= 0 else 0
+    if path_start < 0:
         return False
+    path = url[path_start:]
+    for sep in ("?", "#"):
+        cut = path.find(sep)
+        if cut >= 0:
+            path = path[:cut]
+    parts = [s for s in path.split("/") if s]
     if len(parts) < 3:
         return False
     return parts[0].lower() == org.lower() and parts[1].lower() == "j"
 
 
 def _build_companies(
-    data: Dict[str, Any], *, provider: str, city: str, limit: int
+    data: Dict[str, Any],
+    *,
+    provider: str,
+    city: str,
+    limit: int,
+    host: Optional[str] = None,
 ) -> Tuple[List[Dict[str, Any]], set[str]]:
-    host = pipeline._PROVIDER_HOST[provider]
-    companies: List[Dict[str, Any]] = []
-    seen_orgs = set()
+    host = host or pipeline._PROVIDER_HOST[provider]
+    extract_org = pipeline._extract_org_from_url
+    # why: keyed by lowercased org so "Acme" and "acme" collapse; dicts keep
+    # first-seen order, so no separate seen set is needed
+    orgs: Dict[str, Tuple[str, str]] = {}
     job_link_orgs: set[str] = set()
 
     for item in data.get("organic_results") or []:
         link = item.get("link") or ""
-        if not link or host not in link:
+        if host not in link:
             continue
-        org = pipeline._extract_org_from_url(provider, link)
-        if org and provider == "workable" and _is_workable_job_link(link, org):
-            job_link_orgs.add(org.lower())
-        if not org or org in seen_orgs:
+        org = extract_org(provider, link)
+        if not org:
             continue
-        seen_orgs.add(org)
+        org_lc = org.lower()
+        if provider == "workable" and _is_workable_job_link(link, org_lc):
+            job_link_orgs.add(org_lc)
+        orgs.setdefault(org_lc, (org, link))
 
+    companies: List[Dict[str, Any]] = []
+    for org, link in islice(orgs.values(), limit):
         if provider == "comeet":
             careers_url = pipeline._normalize_comeet_careers_url(link) or link
         elif provider == "workday":
@@ -106,24 +138,15 @@ def _build_companies(
                 "city": city,
             }
         )
-        if len(companies) >= limit:
-            break
 
     return companies, job_link_orgs
 
 
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
 def _slugify(value: str) -> str:
-    out = []
-    last_was_sep = False
-    for ch in (value or "").strip().lower():
-        if "a" <= ch <= "z" or "0" <= ch <= "9":
-            out.append(ch)
-            last_was_sep = False
-            continue
-        if not last_was_sep:
-            out.append("_")
-            last_was_sep = True
-    slug = "".join(out).strip("_")
+    slug = _SLUG_RE.sub("_", (value or "").strip().lower()).strip("_")
     return slug or "city"
 
 
@@ -152,11 +175,27 @@ def _resolve_providers(value: str) -> List[str]:
     return providers
 
 
+def _json_loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
+
+
+def _write_json(path: Path, payload: Any) -> None:
+    # why: orjson emits indented UTF-8 bytes directly; the stdlib fallback
+    # streams into a buffered handle
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as fh:
+        json.dump(payload, fh, indent=2, ensure_ascii=True)
+
+
 def _load_company_list(path: Path) -> List[Dict[str, Any]]:
     if not path.exists():
         return []
     try:
-        raw = json.loads(path.read_text(encoding="utf-8"))
+        raw = _json_loads(path.read_bytes())
     except Exception:
         return []
     if isinstance(raw, dict):
@@ -169,56 +208,147 @@ def _load_company_list(path: Path) -> List[Dict[str, Any]]:
 
 
 def _update_origin_companies(verified: List[Dict[str, Any]], origin_path: Path) -> int:
+    return _update_origin_companies_batch([verified], origin_path)
+
+
+def _update_origin_companies_batch(
+    groups: Iterable[List[Dict[str, Any]]], origin_path: Path
+) -> int:
+    # why: load and rewrite the origin once for many city/provider groups
+    # instead of one full JSON round-trip per group
     existing = _load_company_list(origin_path)
-    existing_keys = set()
-    for company in existing:
-        key = _company_key(company)
-        if key:
+    existing_keys = {k for k in (_company_key(c) for c in existing) if k}
+    new: List[Dict[str, Any]] = []
+    for verified in groups:
+        for company in verified:
+            key = _company_key(company)
+            if not key or key in existing_keys:
+                continue
             existing_keys.add(key)
-    added = 0
-    for company in verified:
-        key = _company_key(company)
-        if not key or key in existing_keys:
-            continue
-        existing_keys.add(key)
-        existing.append(company)
-        added += 1
+            new.append(company)
+    added = len(new)
     if added:
+        existing.extend(new)
         origin_path.parent.mkdir(parents=True, exist_ok=True)
-        origin_path.write_text(
-            json.dumps({"companies": existing}, indent=2, ensure_ascii=True),
-            encoding="utf-8",
-        )
+        # why: write a sibling temp file and swap it in so a crash mid-write
+        # never leaves a truncated companies.json behind
+        tmp_path = origin_path.with_name(origin_path.name + ".tmp")
+        _write_json(tmp_path, {"companies": existing})
+        os.replace(tmp_path, origin_path)
     return added
 
 
+_VERIFY_MAX_WORKERS = 16
+_VERIFY_PER_PROVIDER = 8
+_PROVIDER_SLOTS: Dict[str, threading.BoundedSemaphore] = {}
+_PROVIDER_SLOTS_LOCK = threading.Lock()
+
+
+def _provider_slot(provider: str) -> threading.BoundedSemaphore:
+    # why: cap in-flight requests per ATS API so one host is not hammered
+    with _PROVIDER_SLOTS_LOCK:
+        slot = _PROVIDER_SLOTS.get(provider)
+        if slot is None:
+            slot = threading.BoundedSemaphore(_VERIFY_PER_PROVIDER)
+            _PROVIDER_SLOTS[provider] = slot
+        return slot
+
+
+_FETCHERS: Dict[str, Callable[..., Any]] = {}
+
+
+def _fetcher(provider: str) -> Optional[Callable[..., Any]]:
+    # why: resolved once per provider; workers then share a plain dict read.
+    # Only hits are kept so a failed import is retried on the next call.
+    fetch = _FETCHERS.get(provider)
+    if fetch is None:
+        mod = pipeline._import_provider(provider)
+        found = getattr(mod, "fetch_jobs", None) if mod else None
+        if not callable(found):
+            return None
+        fetch = _FETCHERS[provider] = found
+    return fetch
+
+
 def _verify_companies_with_jobs(
     companies: List[Dict[str, Any]],
     provider: str,
     job_link_orgs: set[str] | None = None,
     *,
     allow_missing_fetcher: bool = False,
+    strict: bool = False,
 ) -> List[Dict[str, Any]]:
     if not companies:
         return []
-    mod = pipeline._import_provider(provider)
-    fetch = getattr(mod, "fetch_jobs", None) if mod else None
-    if not callable(fetch):
+    fetch = _fetcher(provider)
+    if fetch is None:
         if allow_missing_fetcher:
             return []
         raise SystemExit(f"Provider '{provider}' has no fetch_jobs function.")
-    verified: List[Dict[str, Any]] = []
-    for company in companies:
+
+    slot = _provider_slot(provider)
+    workable_links = job_link_orgs if provider == "workable" else None
+    linked = None if strict else workable_links
+
+    def has_jobs(company: Dict[str, Any]) -> bool:
         org = str(company.get("org") or company.get("name") or "").strip()
         if not org:
-            continue
-        jobs = pipeline._call_fetch(fetch, org, company=company, provider=provider)
+            return False
+        # why: a /<org>/j/<id> link is already proof of a live Workable job
+        if linked and org.lower() in linked:
+            return True
+        with slot:
+            jobs = pipeline._call_fetch(fetch, org, company=company, provider=provider)
         if jobs:
-            verified.append(company)
-            continue
-        if provider == "workable" and job_link_orgs and org.lower() in job_link_orgs:
-            verified.append(company)
-    return verified
+            return True
+        return bool(workable_links and org.lower() in workable_links)
+
+    # why: verification is one HTTP call per company; fan out like _collect_jobs
+    max_workers = min(_VERIFY_MAX_WORKERS, len(companies))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        flags = list(pool.map(has_jobs, companies))
+    return [company for company, ok in zip(companies, flags) if ok]
+
+
+def _serpapi_search(params: Dict[str, Any]) -> Dict[str, Any]:
+    # why: reuse pipeline's on-disk SerpAPI cache so re-runs skip paid queries
+    url = "https://serpapi.com/search.json"
+    no_cache = pipeline._env_bool("SERPAPI_NO_CACHE", False)
+    if not no_cache:
+        cached = pipeline._serpapi_cache_read(url, params=params)
+        if cached is not None:
+            return cached
+    data = pipeline._http_get_json(url, params=params)
+    if not no_cache:
+        pipeline._serpapi_cache_write(url, params=params, payload=data)
+    return data
+
+
+def _discover_one(
+    provider: str,
+    *,
+    city: str,
+    host: str,
+    city_quoted: str,
+    params_base: Dict[str, Any],
+    limit: int,
+    allow_missing_fetcher: bool,
+    strict_verify: bool,
+) -> Tuple[str, List[Dict[str, Any]], List[Dict[str, Any]]]:
+    params = {**params_base, "q": f"site:{host} {city_quoted}"}
+    data = _serpapi_search(params)
+
+    companies, job_link_orgs = _build_companies(
+        data, provider=provider, city=city, limit=limit, host=host
+    )
+    verified = _verify_companies_with_jobs(
+        companies,
+        provider,
+        job_link_orgs=job_link_orgs,
+        allow_missing_fetcher=allow_missing_fetcher,
+        strict=strict_verify,
+    )
+    return provider, companies, verified
 
 
 def main() -> None:
@@ -229,10 +359,11 @@ def main() -> None:
     if not city:
         raise SystemExit("City is required.")
 
+    provider_hosts = pipeline._PROVIDER_HOST
     providers = _resolve_providers(args.provider)
-    unknown = [p for p in providers if p not in pipeline._PROVIDER_HOST]
+    unknown = [p for p in providers if p not in provider_hosts]
     if unknown:
-        options = ", ".join(sorted(pipeline._PROVIDER_HOST.keys()))
+        options = ", ".join(sorted(provider_hosts))
         raise SystemExit(
             f"Unknown provider(s) '{', '.join(unknown)}'. Options: {options}"
         )
@@ -247,35 +378,43 @@ def main() -> None:
     num = max(10, min(100, limit))
     timestamp = time.strftime("%Y%m%d_%H%M%S")
     allow_missing_fetcher = len(providers) > 1
+    # why: only "q" differs per provider; build the rest once
+    city_quoted = f'"{city}"'
+    params_base = {"engine": "google", "num": num, "hl": "en", "api_key": api_key}
 
+    results: Dict[str, Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]] = {}
+    try:
+        with ThreadPoolExecutor(max_workers=min(8, len(providers))) as pool:
+            futures = [
+                pool.submit(
+                    _discover_one,
+                    provider,
+                    city=city,
+                    host=provider_hosts[provider],
+                    city_quoted=city_quoted,
+                    params_base=params_base,
+                    limit=limit,
+                    allow_missing_fetcher=allow_missing_fetcher,
+                    strict_verify=args.strict_verify,
+                )
+                for provider in providers
+            ]
+            for future in as_completed(futures):
+                provider, companies, verified = future.result()
+                results[provider] = (companies, verified)
+                print(
+                    f"{provider}: discovered {len(companies)} companies, verified {len(verified)}"
+                )
+    finally:
+        pipeline._close_http_client()
+
+    # why: keep output order stable regardless of completion order
     all_companies: List[Dict[str, Any]] = []
     all_verified: List[Dict[str, Any]] = []
     for provider in providers:
-        query = f'site:{pipeline._PROVIDER_HOST[provider]} "{city}"'.strip()
-
-        params = {
-            "engine": "google",
-            "q": query,
-            "num": num,
-            "hl": "en",
-            "api_key": api_key,
-        }
-        data = pipeline._http_get_json("https://serpapi.com/search.json", params=params)
-
-        companies, job_link_orgs = _build_companies(
-            data, provider=provider, city=city, limit=limit
-        )
-        verified = _verify_companies_with_jobs(
-            companies,
-            provider,
-            job_link_orgs=job_link_orgs,
-            allow_missing_fetcher=allow_missing_fetcher,
-        )
+        companies, verified = results[provider]
         all_companies.extend(companies)
         all_verified.extend(verified)
-        print(
-            f"{provider}: discovered {len(companies)} companies, verified {len(verified)}"
-        )
     payload = {"companies": all_companies}
 
     out_path = Path(args.out)
@@ -285,14 +424,14 @@ def main() -> None:
         filename = f"companies_{city_slug}_{provider_slug}_{timestamp}.json"
         out_path = out_path / filename
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(
-        json.dumps(payload, indent=2, ensure_ascii=True), encoding="utf-8"
-    )
+    _write_json(out_path, payload)
     print(f"Wrote {len(all_companies)} companies to {out_path}")
     print(f"Verified {len(all_verified)} companies with live jobs")
 
     origin_path = Path(args.origin)
-    added = _update_origin_companies(all_verified, origin_path)
+    added = _update_origin_companies_batch(
+        (results[provider][1] for provider in providers), origin_path
+    )
     print(f"Added {added} companies to {origin_path}")
 
 
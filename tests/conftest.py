@@ -1,16 +1,23 @@
 from __future__ import annotations
 
+import itertools
 import os
+import re
 from types import SimpleNamespace
 from typing import Any, Dict, List, Mapping
 
 import pytest
 
 os.environ.setdefault("AUTO_REFRESH_ON_START", "0")
+# why: importing jobfinder.api builds the module-level app, which runs init_db();
+# default it off ./jobfinder.db, but honour a URL the runner set explicitly
+os.environ.setdefault("JOBFINDER_DATABASE_URL", "sqlite:///:memory:")
 
 from jobfinder.api import create_app
 
-from jobfinder import pipeline
+from jobfinder import db, pipeline
+
+_SITE_RE = re.compile(r"site:([^\s()]+)")
 
 
 @pytest.fixture
@@ -30,19 +37,22 @@ def serpapi_stub(monkeypatch):
     """
 
     def _stub(payloads: Mapping[str, Dict[str, Any]]):
+        # why: resolve each host's results once; calls then look up the
+        # query's site: tokens directly instead of scanning every host
+        dispatch: Dict[str, List[Dict[str, Any]]] = {}
+        for host, payload in payloads.items():
+            results = payload.get("organic_results") if payload else None
+            if isinstance(results, list):
+                dispatch[host] = results
+
         def fake_http(
             url: str, params: Dict[str, Any] | None = None, timeout: float = 25.0
         ):
             query = (params or {}).get("q", "")
             combined: List[Dict[str, Any]] = []
-            for host, payload in payloads.items():
-                if host in query:
-                    results = payload.get("organic_results") if payload else None
-                    if isinstance(results, list):
-                        combined.extend(results)
-            if combined:
-                return {"organic_results": combined}
-            return {"organic_results": []}
+            for host in dict.fromkeys(_SITE_RE.findall(query)):
+                combined.extend(dispatch.get(host, ()))
+            return {"organic_results": combined}
 
         monkeypatch.setattr(pipeline, "_http_get_json", fake_http)
         return fake_http
@@ -57,17 +67,20 @@ def provider_stub(monkeypatch):
     """
 
     def _stub(jobs_by_provider: Mapping[str, Mapping[str, Any]]):
-        def fake_import(provider: str):
-            provider_jobs = jobs_by_provider.get(provider, {})
+        flat = {
+            (provider, key): jobs
+            for provider, provider_jobs in jobs_by_provider.items()
+            for key, jobs in provider_jobs.items()
+        }
 
+        def fake_import(provider: str):
             def fetch_jobs(
                 org: str | None = None,
                 slug: str | None = None,
                 company: str | None = None,
                 **_: Any,
             ):
-                key = org or slug or company or ""
-                return provider_jobs.get(key, [])
+                return flat.get((provider, org or slug or company or ""), [])
 
             return SimpleNamespace(fetch_jobs=fetch_jobs)
 
@@ -77,25 +90,62 @@ def provider_stub(monkeypatch):
     return _stub
 
 
+_MEMORY_DB_IDS = itertools.count()
+
+
 @pytest.fixture
-def temp_db_url(tmp_path, monkeypatch):
+def memory_db_url(monkeypatch):
     """
-    Provide an isolated SQLite DB for each test run.
+    Point JOBFINDER_DATABASE_URL at a fresh named in-memory SQLite DB.
+
+    Shared cache lets every pooled connection (and thread) see the same DB,
+    and the per-test name keeps tests isolated without touching disk.
     """
-    path = tmp_path / "jobs.db"
-    monkeypatch.setenv("JOBFINDER_DATABASE_URL", f"sqlite:///{path.as_posix()}")
-    return path
+    name = f"jobfinder_test_{next(_MEMORY_DB_IDS)}"
+    url = f"sqlite:///file:{name}?mode=memory&cache=shared&uri=true"
+    monkeypatch.setenv("JOBFINDER_DATABASE_URL", url)
+    yield url
+    # why: the memoized StaticPool engine would keep this DB alive all session
+    db.dispose_engine(url)
 
 
-@pytest.fixture()
-def app(monkeypatch):
-    monkeypatch.setenv("JOBFINDER_DATABASE_URL", "sqlite:///:memory:")
-    monkeypatch.setenv("ALLOW_REFRESH_ENDPOINT", "1")
-    app = create_app()
+@pytest.fixture
+def temp_db_url(memory_db_url):
+    """
+    Provide an isolated DB for each test run (named in-memory SQLite).
+    """
+    return memory_db_url
+
+
+@pytest.fixture
+def fresh_db(memory_db_url):
+    """
+    A fresh in-memory DB with the schema already created.
+    """
+    db.init_db()
+    return memory_db_url
+
+
+@pytest.fixture(scope="session")
+def app():
+    """
+    One Flask app per session; config and the DB URL are read per request.
+    create_app() builds a new app each call, so this fixture is the memo.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        # why: create_app() runs init_db(); keep it off the default ./jobfinder.db
+        mp.setenv("JOBFINDER_DATABASE_URL", "sqlite:///:memory:")
+        mp.setenv("ALLOW_REFRESH_ENDPOINT", "1")
+        app = create_app()
     app.config.update(TESTING=True)
+    # why: Flask 3 dropped JSONIFY_PRETTYPRINT_REGULAR; compact lives on app.json
+    app.json.compact = True
     return app
 
 
 @pytest.fixture()
-def client(app):
-    return app.test_client()
+def client(app, monkeypatch, fresh_db):
+    # why: per-test state lives in the env and the fresh in-memory DB, not the app
+    monkeypatch.setenv("ALLOW_REFRESH_ENDPOINT", "1")
+    # why: the API is stateless, so skip the cookie jar
+    return app.test_client(use_cookies=False)
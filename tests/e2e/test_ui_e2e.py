@@ -4,8 +4,11 @@ import threading
 from typing import Iterator
 
 import pytest
-from werkzeug.serving import make_server
+from sqlalchemy import delete
+from werkzeug.serving import WSGIRequestHandler, make_server
 
+from jobfinder import api as api_module
+from jobfinder import db
 from jobfinder.api import create_app
 
 try:
@@ -51,16 +54,34 @@ PROVIDER_STUB = {
 }
 
 
-@pytest.fixture
-def live_server(tmp_path, monkeypatch) -> Iterator[str]:
-    db_path = tmp_path / "jobs.db"
-    monkeypatch.setenv("JOBFINDER_DATABASE_URL", f"sqlite:///{db_path.as_posix()}")
-    monkeypatch.setenv("AUTO_REFRESH_ON_START", "0")
-    monkeypatch.setenv("ALLOW_REFRESH_ENDPOINT", "1")
-    app = create_app()
+class _QuietHandler(WSGIRequestHandler):
+    # why: skip per-request access logging; the browser fires many requests
+    def log_request(self, code: int | str = "-", size: int | str = "-") -> None:
+        pass
+
+
+_E2E_ENV = {"AUTO_REFRESH_ON_START": "0", "ALLOW_REFRESH_ENDPOINT": "1"}
+
+
+@pytest.fixture(scope="session")
+def e2e_db_url(tmp_path_factory) -> str:
+    db_path = tmp_path_factory.mktemp("e2e") / "jobs.db"
+    return f"sqlite:///{db_path.as_posix()}"
+
+
+@pytest.fixture(scope="session")
+def live_server(e2e_db_url) -> Iterator[str]:
+    # why: one app + server per session; reset_db isolates tests instead.
+    # The env is only held while the app is built so later test modules
+    # don't inherit it; e2e_env re-applies it around each e2e test.
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("JOBFINDER_DATABASE_URL", e2e_db_url)
+        for key, val in _E2E_ENV.items():
+            mp.setenv(key, val)
+        app = create_app()
     app.config.update(TESTING=True)
 
-    server = make_server("127.0.0.1", 0, app)
+    server = make_server("127.0.0.1", 0, app, request_handler=_QuietHandler)
     thread = threading.Thread(target=server.serve_forever, daemon=True)
     thread.start()
     addr = server.server_address
@@ -76,6 +97,22 @@ def live_server(tmp_path, monkeypatch) -> Iterator[str]:
         thread.join(timeout=5)
 
 
+@pytest.fixture(autouse=True)
+def e2e_env(monkeypatch, e2e_db_url) -> None:
+    # the server thread reads the DB URL and flags from os.environ per request
+    monkeypatch.setenv("JOBFINDER_DATABASE_URL", e2e_db_url)
+    for key, val in _E2E_ENV.items():
+        monkeypatch.setenv(key, val)
+
+
+@pytest.fixture(autouse=True)
+def reset_db(e2e_env, live_server) -> None:
+    with db.session_scope() as session:
+        session.execute(delete(db.Job))
+        session.execute(delete(db.Company))
+    api_module._invalidate_jobs_cache()
+
+
 @pytest.fixture(scope="session")
 def browser():
     with sync_playwright() as pw:
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+from sqlalchemy import inspect
+
+from jobfinder import db
+
 
 def test_refresh_dedupes_duplicate_jobs(client, provider_stub):
     provider_stub(
@@ -36,3 +40,28 @@ def test_refresh_dedupes_duplicate_jobs(client, provider_stub):
     data = jobs_resp.get_json()
     assert data["count"] == 1
     assert {row["id"] for row in data["results"]} == {"1"}
+
+
+def test_refresh_rebuilds_indexes_after_large_batch(
+    client, provider_stub, monkeypatch, memory_db_url
+):
+    monkeypatch.setattr(db, "_DEFER_INDEX_ROWS", 1)
+    provider_stub(
+        {
+            "greenhouse": {
+                "acme": [
+                    {"id": str(i), "title": "Engineer", "url": f"https://gh/{i}"}
+                    for i in range(3)
+                ]
+            }
+        }
+    )
+    companies = [{"name": "Acme", "org": "acme", "provider": "greenhouse"}]
+
+    refresh_resp = client.post("/refresh", json={"companies": companies})
+    assert refresh_resp.status_code == 200
+    assert refresh_resp.get_json()["summary"]["jobs_seen"] == 3
+
+    engine = db.get_engine(memory_db_url)
+    index_names = {ix["name"] for ix in inspect(engine).get_indexes("jobs")}
+    assert {ix.name for ix in db.Job.__table__.indexes} <= index_names
@@ -49,34 +49,46 @@ def _attempt_search(page, url: str) -> tuple[str, int]:
     return status_text, count
 
 
-def test_search_city_shows_results():
-    url = f"{BASE_URL}/search?cities={quote(CITY)}"
-
+@pytest.fixture(scope="session")
+def browser():
     with sync_playwright() as pw:
         browser = pw.chromium.launch(headless=True)
-        page = browser.new_page()
-        page.set_default_timeout(90000)
-
-        last_status = ""
-        last_count = 0
-        for _ in range(3):
-            status_text, count = _attempt_search(page, url)
-            last_status = status_text
-            last_count = count
-            if "Loaded" in status_text and count > 0:
-                break
-            page.wait_for_timeout(5000)
-            page.reload(wait_until="domcontentloaded")
-
-        assert "Loaded" in last_status, f"Unexpected status: {last_status}"
-        assert last_count > 0, "Expected at least one job result"
-        expect(page.locator("#resultsBody")).not_to_contain_text("No jobs found")
-        page.wait_for_function(
-            """
-            () => Array.from(document.querySelectorAll('#resultsBody tr'))
-              .some(tr => tr.querySelectorAll('td').length >= 6)
-            """,
-            timeout=30000,
-        )
-
+        yield browser
         browser.close()
+
+
+@pytest.fixture
+def page(browser):
+    context = browser.new_context()
+    page = context.new_page()
+    page.set_default_timeout(90000)
+    try:
+        yield page
+    finally:
+        context.close()
+
+
+def test_search_city_shows_results(page):
+    url = f"{BASE_URL}/search?cities={quote(CITY)}"
+
+    last_status = ""
+    last_count = 0
+    for _ in range(3):
+        status_text, count = _attempt_search(page, url)
+        last_status = status_text
+        last_count = count
+        if "Loaded" in status_text and count > 0:
+            break
+        page.wait_for_timeout(5000)
+        page.reload(wait_until="domcontentloaded")
+
+    assert "Loaded" in last_status, f"Unexpected status: {last_status}"
+    assert last_count > 0, "Expected at least one job result"
+    expect(page.locator("#resultsBody")).not_to_contain_text("No jobs found")
+    page.wait_for_function(
+        """
+        () => Array.from(document.querySelectorAll('#resultsBody tr'))
+          .some(tr => tr.querySelectorAll('td').length >= 6)
+        """,
+        timeout=30000,
+    )
@@ -1,11 +1,7 @@
 from __future__ import annotations
 
-from jobfinder.api import create_app
 
-
-def test_discover_refresh_and_jobs(
-    monkeypatch, serpapi_env, serpapi_stub, provider_stub, temp_db_url
-):
+def test_discover_refresh_and_jobs(serpapi_env, serpapi_stub, provider_stub, client):
     serpapi_stub(
         {
             "boards.greenhouse.io": {
@@ -45,10 +41,6 @@ def test_discover_refresh_and_jobs(
         }
     )
 
-    monkeypatch.setenv("ALLOW_REFRESH_ENDPOINT", "1")
-    app = create_app()
-    client = app.test_client()
-
     discover_resp = client.post(
         "/discover",
         json={
@@ -114,6 +114,18 @@ def test_apply_filters_city_blocks_remote_with_region_suffix():
     assert [r["id"] for r in filtered] == []
 
 
+def test_apply_filters_prefers_stored_location_lower():
+    rows = [
+        {"id": "a", "location": "ignored", "location_lower": "tel aviv, israel"},
+        {"id": "b", "location": "Tel  Aviv"},
+        {"id": "c", "location": "Haifa", "location_lower": "haifa"},
+    ]
+
+    filtered = filtering.apply_filters(rows, {"cities": ["Tel Aviv"]})
+
+    assert [r["id"] for r in filtered] == ["a", "b"]
+
+
 def test_apply_filters_respects_age_and_score():
     now = datetime.now(timezone.utc)
     rows = [
@@ -149,6 +149,33 @@ def test_scan_normalizes_and_dedupes(monkeypatch, provider_stub):
     assert all(r["company"] == "Acme" for r in results)
 
 
+def test_import_provider_retries_after_failure(monkeypatch):
+    monkeypatch.delitem(pipeline._PROVIDER_MODULES, "lever", raising=False)
+    with monkeypatch.context() as m:
+        m.setattr(pipeline.importlib.util, "find_spec", lambda _name: None)
+        assert pipeline._import_provider("lever") is None
+
+    mod = pipeline._import_provider("lever")
+
+    assert mod is not None and hasattr(mod, "fetch_jobs")
+    assert pipeline._PROVIDER_MODULES["lever"] is mod
+
+
+def test_dedupe_keys_ids_per_provider():
+    jobs = [
+        {"id": "1", "provider": "greenhouse", "title": "GH"},
+        {"id": "1", "provider": "lever", "title": "Lever"},
+        {"id": "1", "provider": "greenhouse", "title": "GH dup"},
+    ]
+
+    results = pipeline._dedupe(jobs)
+
+    assert [(r["provider"], r["title"]) for r in results] == [
+        ("greenhouse", "GH"),
+        ("lever", "Lever"),
+    ]
+
+
 def test_scan_respects_provider_filter(monkeypatch, provider_stub):
     jobs_by_provider = {
         "greenhouse": {
@@ -192,10 +219,7 @@ def test_scan_respects_provider_filter(monkeypatch, provider_stub):
     assert results[0]["id"] == "lv-1"
 
 
-def test_refresh_and_query_jobs(monkeypatch, provider_stub, tmp_path):
-    db_url = f"sqlite:///{(tmp_path / 'jobs.db').as_posix()}"
-    monkeypatch.setenv("JOBFINDER_DATABASE_URL", db_url)
-
+def test_refresh_and_query_jobs(provider_stub, temp_db_url):
     provider_stub(
         {
             "greenhouse": {
@@ -223,6 +247,7 @@ def test_refresh_and_query_jobs(monkeypatch, provider_stub, tmp_path):
     )
     assert len(results) == 1
     assert results[0]["id"] == "1"
+    assert "location_lower" not in results[0]
 
     # Second refresh with no jobs should mark the existing one inactive
     provider_stub({"greenhouse": {"acme": []}})
@@ -302,3 +327,34 @@ def test_query_jobs_applies_filters_before_limit(
 
     results = pipeline.query_jobs(cities=["Tel Aviv"], keywords=["engineer"], limit=2)
     assert [r["id"] for r in results] == ["05", "04"]
+
+
+def test_query_jobs_batches_keep_order_across_ties_and_null_dates(
+    monkeypatch, provider_stub, temp_db_url
+):
+    dates = ["2025-01-02T00:00:00Z", None, "2025-01-02T00:00:00Z", None, "2025-01-01"]
+    provider_stub(
+        {
+            "greenhouse": {
+                "acme": [
+                    {
+                        "id": str(i),
+                        "title": "Engineer",
+                        "url": f"https://example.com/{i}",
+                        "created_at": created,
+                    }
+                    for i, created in enumerate(dates)
+                ]
+            }
+        }
+    )
+    companies = [{"name": "Acme", "org": "acme", "provider": "greenhouse"}]
+    pipeline.refresh(companies=companies, cities=[], keywords=[])
+
+    expected = [r["id"] for r in pipeline.query_jobs(limit=50)]
+    assert sorted(expected) == ["0", "1", "2", "3", "4"]
+
+    # limit=1 -> two-row batches, so later offsets cross keyset boundaries
+    monkeypatch.setattr(pipeline, "_QUERY_BATCH_MIN", 1)
+    paged = [pipeline.query_jobs(limit=1, offset=i)[0]["id"] for i in range(5)]
+    assert paged == expected
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import sqlite3
+from typing import Any, Dict, Iterator, Tuple
+
+import pytest
+
+from jobfinder.alerts.state import AlertState
+
+
+@pytest.fixture(scope="session")
+def _alert_state_session(tmp_path_factory) -> AlertState:
+    return AlertState(tmp_path_factory.mktemp("alerts") / "alerts.db")
+
+
+@pytest.fixture
+def alert_state(_alert_state_session: AlertState) -> Iterator[AlertState]:
+    """
+    One AlertState database per session; each test starts with an empty table.
+    """
+    yield _alert_state_session
+    con = sqlite3.connect(str(_alert_state_session.db_path))
+    try:
+        with con:
+            con.execute("DELETE FROM seen_jobs")
+    finally:
+        con.close()
+
+
+@pytest.fixture(scope="module")
+def sample_jobs() -> Tuple[Dict[str, Any], ...]:
+    """
+    Two query_jobs-shaped rows; fakes should hand out copies, not the tuple.
+    """
+    return (
+        {
+            "id": "j-1",
+            "title": "Backend Engineer",
+            "company": "Acme",
+            "location": "Tel Aviv",
+            "provider": "lever",
+            "url": "https://example.com/jobs/1",
+            "created_at": "2026-02-14T09:00:00+00:00",
+        },
+        {
+            "id": "j-2",
+            "title": "Platform Engineer",
+            "company": "Beta",
+            "location": "Tel Aviv",
+            "provider": "greenhouse",
+            "url": "https://example.com/jobs/2",
+            "created_at": "2026-02-14T09:30:00+00:00",
+        },
+    )
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+FIXTURES_DIR = Path(__file__).resolve().parents[2] / "fixtures"
+
+
+@lru_cache(maxsize=None)
+def load(name: str) -> Any:
+    """Parse tests/fixtures/<name> once per session; treat the result as read-only."""
+    return json.loads((FIXTURES_DIR / name).read_bytes())
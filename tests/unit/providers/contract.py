@@ -13,18 +13,14 @@ def _is_non_empty_str(value: Any) -> bool:
 def assert_normalized_job(job: Mapping[str, Any]) -> None:
     assert isinstance(job, dict)
 
-    missing = [
-        field for field in REQUIRED_FIELDS if not _is_non_empty_str(job.get(field))
-    ]
-    assert not missing, f"missing required fields: {missing}"
-
-    for field in REQUIRED_FIELDS:
-        assert isinstance(job[field], str)
+    get = job.get
+    if not all(_is_non_empty_str(get(field)) for field in REQUIRED_FIELDS):
+        missing = [f for f in REQUIRED_FIELDS if not _is_non_empty_str(get(f))]
+        raise AssertionError(f"missing required fields: {missing}")
 
     for field in OPTIONAL_STR_FIELDS:
-        val = job.get(field)
-        if val not in (None, ""):
-            assert isinstance(val, str)
+        val = get(field)
+        assert val is None or isinstance(val, str), field
 
-    if job.get("remote") is not None:
+    if get("remote") is not None:
         assert isinstance(job["remote"], bool)
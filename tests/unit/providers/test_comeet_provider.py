@@ -1,18 +1,14 @@
 from __future__ import annotations
 
-import json
-from pathlib import Path
-
 from jobfinder import pipeline
 from jobfinder.providers import comeet
 
+from tests.unit.providers._fixtures import load
 from tests.unit.providers.contract import assert_normalized_job
 
 
 def test_comeet_parsing_is_stable(monkeypatch):
-    fixture = json.loads(
-        Path("tests/fixtures/comeet_positions.json").read_text(encoding="utf-8")
-    )
+    fixture = load("comeet_positions.json")
     captured = {}
 
     def fake_get_json(url, params=None):
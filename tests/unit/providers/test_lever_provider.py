@@ -1,19 +1,16 @@
 from __future__ import annotations
 
-import json
-from pathlib import Path
-from urllib.error import HTTPError
+import httpx
 
 from jobfinder import pipeline
 from jobfinder.providers import lever
 
+from tests.unit.providers._fixtures import load
 from tests.unit.providers.contract import assert_normalized_job
 
 
 def test_lever_parsing_is_stable(monkeypatch):
-    fixture = json.loads(
-        Path("tests/fixtures/lever_postings.json").read_text(encoding="utf-8")
-    )
+    fixture = load("lever_postings.json")
 
     monkeypatch.setattr(lever, "get_json", lambda url: fixture)
 
@@ -31,10 +28,8 @@ def test_lever_parsing_is_stable(monkeypatch):
 def test_lever_returns_empty_on_404(monkeypatch):
     from jobfinder.providers import _http
 
-    def fake_urlopen(req, timeout=30, context=None):
-        raise HTTPError(req.full_url, 404, "Not Found", hdrs=None, fp=None)
-
-    monkeypatch.setattr(_http, "urlopen", fake_urlopen)
+    transport = httpx.MockTransport(lambda request: httpx.Response(404))
+    monkeypatch.setattr(_http, "_CLIENT", httpx.Client(transport=transport))
 
     jobs = lever.fetch_jobs("missing-org")
     assert jobs == []
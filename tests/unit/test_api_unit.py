@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from concurrent.futures import Future
+from typing import Any, Dict, List, Tuple
 
 import jobfinder.api as api_module
 import jobfinder.pipeline as pipeline
@@ -12,7 +13,9 @@ def test_healthz_returns_ok(client):
     assert resp.get_json() == {"ok": True}
 
 
-def test_discover_calls_pipeline_and_returns_companies(monkeypatch, client):
+def test_discover_calls_pipeline_and_returns_companies(
+    monkeypatch, client, serpapi_env
+):
     captured: Dict[str, Any] = {}
 
     def fake_discover(*, cities, keywords, sources, limit):
@@ -23,7 +26,6 @@ def test_discover_calls_pipeline_and_returns_companies(monkeypatch, client):
         return [{"provider": "lever", "org": "acme"}]
 
     monkeypatch.setattr(pipeline, "discover", fake_discover)
-    monkeypatch.setenv("SERPAPI_API_KEY", "test-key")
 
     resp = client.post(
         "/discover",
@@ -44,28 +46,30 @@ def test_discover_calls_pipeline_and_returns_companies(monkeypatch, client):
     assert captured["limit"] == 3
 
 
-def test_discover_returns_500_on_exception(monkeypatch, client):
+def test_discover_returns_500_on_exception(monkeypatch, client, serpapi_env):
     def bad_discover(*, cities, keywords, sources, limit):
         raise RuntimeError("boom")
 
     monkeypatch.setattr(pipeline, "discover", bad_discover)
-    monkeypatch.setenv("SERPAPI_API_KEY", "test-key")
 
     resp = client.post("/discover", json={"cities": ["Tel Aviv"]})
     assert resp.status_code == 500
     assert "boom" in resp.get_json()["error"]
 
 
+# Plain dicts (not MappingProxyType) so jsonify can serialize the rows.
+_FAKE_SCAN_JOBS: Tuple[Dict[str, Any], ...] = (
+    {"id": "x1", "company": "Acme", "title": "QA Engineer"},
+    {"id": "x2", "company": "Acme", "title": "Designer"},
+)
+
+
 def test_scan_calls_pipeline_and_filters_title_keywords(monkeypatch, client):
-    fake_jobs: List[Dict[str, Any]] = [
-        {"id": "x1", "company": "Acme", "title": "QA Engineer"},
-        {"id": "x2", "company": "Acme", "title": "Designer"},
-    ]
     captured: Dict[str, Any] = {}
 
     def fake_scan(**kwargs):
         captured.update(kwargs)
-        return fake_jobs
+        return list(_FAKE_SCAN_JOBS)
 
     monkeypatch.setattr(pipeline, "scan", fake_scan)
 
@@ -113,22 +117,13 @@ def test_search_route_renders_quick_search_filters(client):
     assert b'id="onlyNewToggle"' in resp.data
 
 
-def test_jobs_email_sends_filtered_results(monkeypatch, client):
+def test_jobs_email_sends_filtered_results(monkeypatch, client, sample_jobs):
     captured_query: Dict[str, Any] = {}
     captured_email: Dict[str, Any] = {}
 
     def fake_query_jobs(**kwargs):
         captured_query.update(kwargs)
-        return [
-            {
-                "id": "1",
-                "title": "Backend Engineer",
-                "company": "Acme",
-                "location": "Tel Aviv",
-                "provider": "lever",
-                "url": "https://example.com/jobs/1",
-            }
-        ]
+        return [dict(sample_jobs[0])]
 
     def fake_send_email_gmail(*, subject, text, to_addrs):
         captured_email["subject"] = subject
@@ -162,6 +157,93 @@ def test_jobs_email_sends_filtered_results(monkeypatch, client):
     assert "Backend Engineer" in captured_email["text"]
 
 
+class _InlineExecutor:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, /, **kwargs):
+        self.submitted.append(fn)
+        future = Future()
+        try:
+            future.set_result(fn(**kwargs))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+
+def _smtp_env(monkeypatch):
+    monkeypatch.setenv("SMTP_USER", "bot@example.com")
+    monkeypatch.setenv("SMTP_PASS", "secret")
+
+
+def test_jobs_email_background_queues_and_reports_delivery(
+    monkeypatch, client, sample_jobs
+):
+    sent_to: List[List[str]] = []
+    executor = _InlineExecutor()
+    monkeypatch.setattr(pipeline, "query_jobs", lambda **_: [dict(sample_jobs[0])])
+    monkeypatch.setattr(
+        api_module,
+        "send_email_gmail",
+        lambda *, subject, text, to_addrs: sent_to.append(list(to_addrs)),
+    )
+    monkeypatch.setattr(api_module, "_EMAIL_EXECUTOR", executor)
+    _smtp_env(monkeypatch)
+
+    resp = client.post(
+        "/jobs/email", json={"email": "dev@example.com", "background": True}
+    )
+
+    assert resp.status_code == 202
+    data = resp.get_json()
+    assert data["queued"] is True
+    assert data["sent"] is False
+    assert len(executor.submitted) == 1
+    assert sent_to == [["dev@example.com"]]
+
+    status = client.get(data["status_url"]).get_json()
+    assert status == {"job_id": data["job_id"], "status": "sent", "sent": True}
+
+
+def test_jobs_email_background_surfaces_delivery_failure(monkeypatch, client):
+    def failing_send(*, subject, text, to_addrs):
+        raise RuntimeError("auth rejected")
+
+    monkeypatch.setattr(pipeline, "query_jobs", lambda **_: [])
+    monkeypatch.setattr(api_module, "send_email_gmail", failing_send)
+    monkeypatch.setattr(api_module, "_EMAIL_EXECUTOR", _InlineExecutor())
+    _smtp_env(monkeypatch)
+
+    resp = client.post(
+        "/jobs/email", json={"email": "dev@example.com", "background": True}
+    )
+    assert resp.status_code == 202
+
+    status = client.get(resp.get_json()["status_url"]).get_json()
+    assert status["status"] == "failed"
+    assert status["sent"] is False
+    assert "auth rejected" in status["error"]
+
+
+def test_jobs_email_background_reports_missing_smtp_before_enqueue(monkeypatch, client):
+    executor = _InlineExecutor()
+    monkeypatch.setattr(pipeline, "query_jobs", lambda **_: [])
+    monkeypatch.setattr(api_module, "_EMAIL_EXECUTOR", executor)
+    monkeypatch.delenv("SMTP_USER", raising=False)
+
+    resp = client.post(
+        "/jobs/email", json={"email": "dev@example.com", "background": True}
+    )
+
+    assert resp.status_code == 503
+    assert "SMTP_USER" in resp.get_json()["error"]
+    assert executor.submitted == []
+
+
+def test_jobs_email_status_unknown_job_is_404(client):
+    assert client.get("/jobs/email/nope").status_code == 404
+
+
 def test_jobs_email_requires_valid_email(client):
     resp = client.post(
         "/jobs/email",
@@ -171,70 +253,46 @@ def test_jobs_email_requires_valid_email(client):
     assert "Invalid email" in resp.get_json()["error"]
 
 
-def test_saved_alert_create_list_delete_flow(client):
-    create_resp = client.post(
-        "/alerts/searches",
-        json={
-            "email": "dev@example.com",
-            "cities": "Tel Aviv",
-            "title_keywords": ["Backend"],
-            "frequency_minutes": 30,
-            "send_limit": 100,
-        },
-    )
-    assert create_resp.status_code == 200
-    create_data = create_resp.get_json()
-    assert create_data["created"] is True
-    alert_id = int(create_data["alert"]["id"])
-
-    list_resp = client.get("/alerts/searches?email=dev@example.com")
-    assert list_resp.status_code == 200
-    list_data = list_resp.get_json()
-    assert list_data["count"] == 1
-    assert list_data["alerts"][0]["id"] == alert_id
-    assert list_data["alerts"][0]["title_keywords"] == ["Backend"]
+def _create_alert(client, **fields):
+    payload = {"email": "dev@example.com", "cities": "Tel Aviv", **fields}
+    resp = client.post("/alerts/searches", json=payload)
+    assert resp.status_code == 200
+    return resp.get_json()
 
-    delete_resp = client.delete(f"/alerts/searches/{alert_id}?email=dev@example.com")
-    assert delete_resp.status_code == 200
-    assert delete_resp.get_json()["deleted"] is True
 
-    after_delete = client.get("/alerts/searches?email=dev@example.com")
-    assert after_delete.status_code == 200
-    assert after_delete.get_json()["count"] == 0
+def _list_alerts(client):
+    resp = client.get("/alerts/searches?email=dev@example.com")
+    assert resp.status_code == 200
+    return resp.get_json()
 
 
-def test_saved_alert_duplicate_create_updates_existing(client):
-    first = client.post(
-        "/alerts/searches",
-        json={
-            "email": "dev@example.com",
-            "cities": "Tel Aviv",
-            "title_keywords": ["Backend"],
-            "frequency_minutes": 60,
-        },
+def test_saved_alert_create_upsert_list_delete_flow(client):
+    created = _create_alert(
+        client, title_keywords=["Backend"], frequency_minutes=30, send_limit=100
     )
-    assert first.status_code == 200
-    first_data = first.get_json()
-    alert_id = int(first_data["alert"]["id"])
-    assert first_data["created"] is True
+    assert created["created"] is True
+    alert_id = int(created["alert"]["id"])
 
-    second = client.post(
-        "/alerts/searches",
-        json={
-            "email": "dev@example.com",
-            "cities": "Tel Aviv",
-            "title_keywords": ["Backend"],
-            "frequency_minutes": 15,
-        },
-    )
-    assert second.status_code == 200
-    second_data = second.get_json()
-    assert second_data["created"] is False
-    assert int(second_data["alert"]["id"]) == alert_id
-    assert int(second_data["alert"]["frequency_minutes"]) == 15
+    listed = _list_alerts(client)
+    assert listed["count"] == 1
+    assert listed["alerts"][0]["id"] == alert_id
+    assert listed["alerts"][0]["title_keywords"] == ["Backend"]
 
+    # Same search again updates the existing alert instead of adding one.
+    updated = _create_alert(client, title_keywords=["Backend"], frequency_minutes=15)
+    assert updated["created"] is False
+    assert int(updated["alert"]["id"]) == alert_id
+    assert int(updated["alert"]["frequency_minutes"]) == 15
+    assert _list_alerts(client)["count"] == 1
 
-def test_alerts_run_endpoint_calls_worker_when_enabled(monkeypatch, client):
+    delete_resp = client.delete(f"/alerts/searches/{alert_id}?email=dev@example.com")
+    assert delete_resp.status_code == 200
+    assert delete_resp.get_json()["deleted"] is True
+
+    assert _list_alerts(client)["count"] == 0
+
+
+def test_alerts_run_endpoint_calls_worker_when_enabled(monkeypatch, app):
     monkeypatch.setenv("ALLOW_ALERTS_RUN_ENDPOINT", "1")
 
     def fake_run_due_alerts_once(*, batch_limit):
@@ -243,7 +301,11 @@ def test_alerts_run_endpoint_calls_worker_when_enabled(monkeypatch, client):
 
     monkeypatch.setattr(api_module, "run_due_alerts_once", fake_run_due_alerts_once)
 
-    resp = client.post("/alerts/run", json={"batch_limit": 12})
+    # why: only the worker wiring is under test, so skip routing and call the view
+    with app.test_request_context(
+        "/alerts/run", method="POST", json={"batch_limit": 12}
+    ):
+        resp = api_module.run_saved_search_alerts()
     assert resp.status_code == 200
     assert resp.get_json()["summary"]["sent_jobs"] == 3
 
@@ -254,6 +316,30 @@ def test_alerts_run_endpoint_disabled_by_default(client):
     assert "disabled" in resp.get_json()["error"].lower()
 
 
+def test_jobs_caches_identical_queries_until_refresh(monkeypatch, client):
+    monkeypatch.setenv("ALLOW_REFRESH_ENDPOINT", "1")
+    calls: List[Dict[str, Any]] = []
+
+    def fake_query_jobs(**kwargs):
+        calls.append(kwargs)
+        return [{"id": str(len(calls)), "title": "Backend Engineer"}]
+
+    monkeypatch.setattr(pipeline, "query_jobs", fake_query_jobs)
+    monkeypatch.setattr(pipeline, "refresh", lambda **_: {"jobs_seen": 0})
+
+    first = client.get("/jobs", query_string={"provider": "lever", "limit": 5})
+    second = client.get("/jobs", query_string={"limit": 5, "provider": "lever"})
+    assert len(calls) == 1
+    assert second.get_json()["results"] == first.get_json()["results"]
+
+    client.get("/jobs", query_string={"provider": "lever", "limit": 6})
+    assert len(calls) == 2
+
+    assert client.post("/refresh", json={"companies": []}).status_code == 200
+    client.get("/jobs", query_string={"provider": "lever", "limit": 5})
+    assert len(calls) == 3
+
+
 def test_jobs_includes_startup_refresh_metadata(monkeypatch, client):
     import jobfinder.api as api_mod
 
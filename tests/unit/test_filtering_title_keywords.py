@@ -1,7 +1,20 @@
 from __future__ import annotations
 
+import random
+
+import pytest
+
 from jobfinder import filtering
 
+_TITLES = (
+    "Senior QA Engineer",
+    "DevOps Lead",
+    "Software engineer",
+    "Product Manager",
+    "Data Scientist",
+    "Backend Developer",
+)
+
 
 def test_filter_by_title_keywords_matches_case_insensitive_substrings():
     rows = [
@@ -24,3 +37,29 @@ def test_filter_by_title_keywords_returns_all_when_empty():
     filtered = filtering.filter_by_title_keywords(rows, [])
 
     assert filtered == rows
+
+
+@pytest.fixture(scope="module")
+def title_corpus():
+    rng = random.Random(0)
+    return [{"id": str(i), "title": rng.choice(_TITLES)} for i in range(10_000)]
+
+
+def _per_row_filter(rows, keywords):
+    # The pre-regex implementation: any normalized keyword substring per row.
+    needles = [filtering.normalize(k) for k in keywords if k]
+    return [
+        r
+        for r in rows
+        if any(n in filtering.normalize(str(r.get("title") or "")) for n in needles)
+    ]
+
+
+@pytest.mark.parametrize("keywords", [["QA", "ENGINEER"], ["devops"], ["nurse"]])
+def test_filter_by_title_keywords_matches_per_row_filter_on_corpus(
+    title_corpus, keywords
+):
+    filtered = filtering.filter_by_title_keywords(title_corpus, keywords)
+
+    expected = _per_row_filter(title_corpus, keywords)
+    assert [r["id"] for r in filtered] == [r["id"] for r in expected]
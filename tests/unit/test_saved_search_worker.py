@@ -1,18 +1,17 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
+import pytest
 from sqlalchemy import select
 
 from jobfinder import db, pipeline
 from jobfinder.alerts import saved_search_worker as worker
 
+pytestmark = pytest.mark.slow
 
-def test_saved_search_worker_sends_only_new_jobs(monkeypatch, tmp_path):
-    db_path = tmp_path / "alerts_worker.db"
-    monkeypatch.setenv("JOBFINDER_DATABASE_URL", f"sqlite:///{db_path.as_posix()}")
-    db.init_db()
 
+def test_saved_search_worker_sends_only_new_jobs(monkeypatch, fresh_db, sample_jobs):
     with db.session_scope() as session:
         alert, created = db.upsert_saved_search_alert(
             session,
@@ -25,27 +24,6 @@ def test_saved_search_worker_sends_only_new_jobs(monkeypatch, tmp_path):
         assert created is True
         alert_id = int(alert.id)
 
-    sample_jobs = [
-        {
-            "id": "j-1",
-            "title": "Backend Engineer",
-            "company": "Acme",
-            "location": "Tel Aviv",
-            "provider": "lever",
-            "url": "https://example.com/jobs/1",
-            "created_at": "2026-02-14T09:00:00+00:00",
-        },
-        {
-            "id": "j-2",
-            "title": "Platform Engineer",
-            "company": "Beta",
-            "location": "Tel Aviv",
-            "provider": "greenhouse",
-            "url": "https://example.com/jobs/2",
-            "created_at": "2026-02-14T09:30:00+00:00",
-        },
-    ]
-
     sent_calls = []
 
     def fake_query_jobs(**kwargs):
@@ -59,18 +37,15 @@ def test_saved_search_worker_sends_only_new_jobs(monkeypatch, tmp_path):
     monkeypatch.setattr(pipeline, "query_jobs", fake_query_jobs)
     monkeypatch.setattr(worker, "send_email_gmail", fake_send_email_gmail)
 
-    first = worker.run_due_alerts_once(batch_limit=20)
+    # why: drive the worker's clock directly instead of rewriting next_run_at
+    t0 = datetime.now(timezone.utc)
+    first = worker.run_due_alerts_once(now=t0, batch_limit=20)
     assert first["processed"] == 1
     assert first["sent_alerts"] == 1
     assert first["sent_jobs"] == 2
     assert len(sent_calls) == 1
 
-    with db.session_scope() as session:
-        row = db.get_saved_search_alert(session, alert_id=alert_id)
-        assert row is not None
-        row.next_run_at = datetime.now(timezone.utc)
-
-    second = worker.run_due_alerts_once(batch_limit=20)
+    second = worker.run_due_alerts_once(now=t0 + timedelta(minutes=10), batch_limit=20)
     assert second["processed"] == 1
     assert second["noop"] == 1
     assert second["sent_alerts"] == 0
@@ -86,11 +61,7 @@ def test_saved_search_worker_sends_only_new_jobs(monkeypatch, tmp_path):
         assert len(seen_rows) == 2
 
 
-def test_deleted_alert_is_not_processed(monkeypatch, tmp_path):
-    db_path = tmp_path / "alerts_worker_delete.db"
-    monkeypatch.setenv("JOBFINDER_DATABASE_URL", f"sqlite:///{db_path.as_posix()}")
-    db.init_db()
-
+def test_deleted_alert_is_not_processed(monkeypatch, fresh_db):
     with db.session_scope() as session:
         alert, _ = db.upsert_saved_search_alert(
             session,